@@ -1,5 +1,5 @@
 import os
-import json
+import orjson
 import logging
 from dataclasses import dataclass
 from typing import List, Optional, Dict, Any
@@ -35,8 +35,8 @@ class FacebookConfig:
             raise ValueError(f"Missing required environment variables: {', '.join(missing)}")
         
         try:
-            ad_account_ids = json.loads(ad_account_ids_json)
-        except json.JSONDecodeError:
+            ad_account_ids = orjson.loads(ad_account_ids_json)
+        except orjson.JSONDecodeError:
             raise ValueError(f"Invalid JSON in FB_AD_ACCOUNT_ID: {ad_account_ids_json}")
         
         return cls(
@@ -99,7 +99,9 @@ class PipelineConfig:
     delay_between_chunks: float = 0.2
     enable_validation: bool = False
     update_kpi_mappings: bool = True
-    
+    load_concurrency: int = 8
+    streaming_threshold: int = 500
+
     @classmethod
     def from_env(cls) -> 'PipelineConfig':
         """Create PipelineConfig from environment variables"""
@@ -108,7 +110,9 @@ class PipelineConfig:
             chunk_days=int(os.getenv('PIPELINE_CHUNK_DAYS', '7')),
             delay_between_chunks=float(os.getenv('PIPELINE_DELAY', '0.2')),
             enable_validation=os.getenv('PIPELINE_ENABLE_VALIDATION', 'false').lower() == 'true',
-            update_kpi_mappings=os.getenv('PIPELINE_UPDATE_KPI_MAPPINGS', 'true').lower() == 'true'
+            update_kpi_mappings=os.getenv('PIPELINE_UPDATE_KPI_MAPPINGS', 'true').lower() == 'true',
+            load_concurrency=int(os.getenv('PIPELINE_LOAD_CONCURRENCY', '8')),
+            streaming_threshold=int(os.getenv('PIPELINE_STREAMING_THRESHOLD', '500'))
         )
 
 
@@ -173,7 +177,9 @@ class Config:
                 'chunk_days': self.pipeline.chunk_days,
                 'delay_between_chunks': self.pipeline.delay_between_chunks,
                 'enable_validation': self.pipeline.enable_validation,
-                'update_kpi_mappings': self.pipeline.update_kpi_mappings
+                'update_kpi_mappings': self.pipeline.update_kpi_mappings,
+                'load_concurrency': self.pipeline.load_concurrency,
+                'streaming_threshold': self.pipeline.streaming_threshold
             }
         }
     
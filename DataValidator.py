@@ -1,14 +1,102 @@
 import logging
-import datetime
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
 from typing import List, Dict, Tuple, Any, Optional
 from collections import defaultdict
 
+import pandas as pd
+import pyarrow as pa
+
+# Optional JIT kernels; the pandas path covers everything when numba is
+# not installed
+try:
+    import _fast_validate
+except ImportError:
+    _fast_validate = None
+
 logger = logging.getLogger(__name__)
 
 
+class RecordValidationError(ValueError):
+    """Raised when a record fails validation or coercion
+
+    Carries the full per-field issue list so callers get the same detail
+    a separate validation pass used to provide.
+    """
+
+    def __init__(self, issues: List[str]):
+        super().__init__('; '.join(issues))
+        self.issues = issues
+
+
+# Module-level coercers for the per-record path: resolved once into the
+# scalar plan so the hot loop skips dict lookups and bound-method dispatch.
+# Each branches on the exact type once to avoid a redundant str() round trip
+def _coerce_float(value):
+    if type(value) is float:
+        return value
+    if type(value) is str or type(value) is int:
+        return float(value)
+    return float(str(value))
+
+
+def _coerce_int(value):
+    if type(value) is int:
+        return value
+    if type(value) is str:
+        return int(value)
+    return int(str(value))
+
+
+def _valid_iso_date(s: str) -> bool:
+    """Cheap fixed-format YYYY-MM-DD check
+
+    The dates here always arrive in ISO form, so a length + digit test
+    replaces strptime's regex/locale machinery (~10x less per call).
+    """
+    return (
+        len(s) == 10 and s[4] == '-' and s[7] == '-'
+        and s[:4].isdigit() and s[5:7].isdigit() and s[8:].isdigit()
+    )
+
+
+def _make_action_converter(target_type, nullable):
+    """Specialize the per-item action value converter for one field
+
+    Binding the target type and nullability up front removes two dict
+    lookups per action item from the inner conversion loop.
+    """
+    def convert(value):
+        if value is None and nullable:
+            return None
+        return target_type(str(value))
+    return convert
+
+
+def _coerce_date(value):
+    value = str(value)
+    if not _valid_iso_date(value):
+        raise ValueError(f"Invalid date value: {value}")
+    return value
+
+
 class DataValidator:
     """Handles data validation and transformation for BigQuery compatibility"""
-    
+
+    # Action lists at least this long are converted with pandas instead of
+    # the per-item converter
+    _VECTORIZE_MIN_ACTIONS = 32
+
+    # Fixed slots: attribute reads in the per-record loops resolve to a
+    # C-slot offset instead of a __dict__ lookup
+    __slots__ = (
+        'schema', 'float_fields', 'int_fields', 'date_fields', 'action_fields',
+        '_scalar_coercers', '_action_converters',
+        '_schema_keys', '_scalar_keys', '_action_keys', '_process_pool'
+    )
+
+
     def __init__(self, schema: Dict[str, Dict[str, Any]]):
         """Initialize validator with schema definition
         
@@ -17,26 +105,53 @@ class DataValidator:
                    Format: {field_name: {'type': type, 'nullable': bool, 'nested': bool}}
         """
         self.schema = schema
+        self._process_pool = None
         self._build_field_lists()
-    
+
+    def __getstate__(self):
+        # The coercion plans hold closures that don't pickle (and the
+        # process pool can't travel either); workers rebuild from the schema
+        return {'schema': self.schema}
+
+    def __setstate__(self, state):
+        self.schema = state['schema']
+        self._process_pool = None
+        self._build_field_lists()
+
+
     def _build_field_lists(self):
         """Build categorized field lists from schema"""
-        self.float_fields = [
-            field for field, info in self.schema.items() 
+        self.float_fields = tuple(
+            field for field, info in self.schema.items()
             if info['type'] == float and not info.get('nested')
-        ]
-        self.int_fields = [
-            field for field, info in self.schema.items() 
+        )
+        self.int_fields = tuple(
+            field for field, info in self.schema.items()
             if info['type'] == int and not info.get('nested')
-        ]
-        self.date_fields = [
-            field for field, info in self.schema.items() 
+        )
+        self.date_fields = tuple(
+            field for field, info in self.schema.items()
             if info['type'] == 'date' and not info.get('nested')
-        ]
+        )
         self.action_fields = {
-            field: info for field, info in self.schema.items() 
+            field: info for field, info in self.schema.items()
             if info.get('nested') is True
         }
+        # Precompiled field->coercer map plus frozen key sets so the
+        # per-record paths use one set intersection instead of per-field
+        # membership tests against the record dict
+        self._scalar_coercers = {
+            **{field: _coerce_float for field in self.float_fields},
+            **{field: _coerce_int for field in self.int_fields},
+            **{field: _coerce_date for field in self.date_fields},
+        }
+        self._action_converters = {
+            field: _make_action_converter(info['type'], info.get('nullable', True))
+            for field, info in self.action_fields.items()
+        }
+        self._schema_keys = frozenset(self.schema)
+        self._scalar_keys = frozenset(self._scalar_coercers)
+        self._action_keys = frozenset(self.action_fields)
     
     def validate_record(self, record: dict, verbose: bool = False) -> Tuple[bool, List[str]]:
         """Validate a single record against the schema
@@ -49,26 +164,26 @@ class DataValidator:
             Tuple of (is_valid, list_of_issues)
         """
         issues = []
-        
-        # Validate regular (non-nested) fields
-        for field, info in self.schema.items():
-            if info.get('nested'):
-                continue
-                
-            if field in record and record[field] is not None:
+
+        # Validate regular (non-nested) fields; the set intersection finds
+        # the present fields in one C-level op instead of 40 dict probes
+        for field in self._scalar_keys & record.keys():
+            if record[field] is not None:
+                info = self.schema[field]
                 try:
                     if info['type'] == float:
                         float(str(record[field]))
                     elif info['type'] == int:
                         int(str(record[field]))
                     elif info['type'] == 'date':
-                        datetime.datetime.strptime(str(record[field]), '%Y-%m-%d')
+                        if not _valid_iso_date(str(record[field])):
+                            raise ValueError(f"Invalid date: {record[field]}")
                 except ValueError as e:
                     issues.append(f"Invalid {info['type'].__name__ if hasattr(info['type'], '__name__') else info['type']} value in {field}: {record[field]}")
-        
+
         # Validate nested action fields
-        for field, info in self.action_fields.items():
-            if field in record and record[field]:
+        for field in self._action_keys & record.keys():
+            if record[field]:
                 if not isinstance(record[field], list):
                     issues.append(f"{field} is not a list: {type(record[field])}")
                 else:
@@ -83,49 +198,51 @@ class DataValidator:
         
         return len(issues) == 0, issues
     
-    def transform_for_bigquery(self, record: dict) -> Optional[dict]:
-        """Transform a record into BigQuery-compatible format
-        
+    def transform_for_bigquery(self, record: dict) -> dict:
+        """Validate and transform a record in a single pass
+
+        Coercion doubles as validation: every conversion failure is
+        collected rather than re-checking each field separately first, so
+        valid records (the common case) pay for one walk instead of two.
+
         Args:
             record: Record to transform
-            
+
         Returns:
-            Transformed record or None if transformation fails
+            Transformed record
+
+        Raises:
+            RecordValidationError: If any field fails coercion, carrying
+                                   the full per-field issue list
         """
-        try:
-            prepared = dict(record)
-            
-            # Handle action fields with specific type requirements
-            for field_name, field_info in self.action_fields.items():
-                if field_name in prepared:
-                    prepared[field_name] = self._validate_and_convert_action_field(
-                        field_name, 
-                        prepared[field_name],
-                        field_info
-                    )
-            
-            # Convert float fields
-            for field in self.float_fields:
-                if field in prepared and prepared[field] is not None:
-                    prepared[field] = float(str(prepared[field]))
-            
-            # Convert integer fields
-            for field in self.int_fields:
-                if field in prepared and prepared[field] is not None:
-                    prepared[field] = int(str(prepared[field]))
-            
-            # Ensure date fields are properly formatted
-            for field in self.date_fields:
-                if field in prepared and prepared[field] is not None:
-                    # Validate date format
-                    datetime.datetime.strptime(str(prepared[field]), '%Y-%m-%d')
-                    prepared[field] = str(prepared[field])
-            
-            return prepared
-            
-        except Exception as e:
-            logger.error(f"Error transforming record: {str(e)}")
-            return None
+        prepared = dict(record)
+        issues = []
+
+        # Handle action fields with specific type requirements
+        for field_name in self._action_keys & prepared.keys():
+            try:
+                prepared[field_name] = self._validate_and_convert_action_field(
+                    field_name,
+                    prepared[field_name],
+                    self.action_fields[field_name]
+                )
+            except ValueError as e:
+                issues.append(str(e))
+
+        # Coerce the scalar fields actually present (one set intersection,
+        # then direct coercer lookups)
+        for field in self._scalar_keys & prepared.keys():
+            value = prepared[field]
+            if value is not None:
+                try:
+                    prepared[field] = self._scalar_coercers[field](value)
+                except (ValueError, TypeError):
+                    issues.append(f"Invalid value in {field}: {value!r}")
+
+        if issues:
+            raise RecordValidationError(issues)
+
+        return prepared
     
     def _validate_and_convert_action_field(self, 
                                           field_name: str, 
@@ -138,77 +255,265 @@ class DataValidator:
         if not isinstance(actions, list):
             raise ValueError(f"{field_name} must be a list, got {type(actions)}")
         
-        converted_actions = []
-        
+        # One pass splits the list-of-dicts into parallel type/value
+        # columns (SoA) so conversion can run over a flat list
+        types = []
+        values = []
         for idx, action in enumerate(actions):
             if not isinstance(action, dict):
                 raise ValueError(f"Item {idx} in {field_name} must be a dictionary, got {type(action)}")
-                
+
             if not all(k in action for k in ['action_type', 'value']):
                 raise ValueError(f"Item {idx} in {field_name} missing required keys: {action}")
-            
+
+            types.append(str(action['action_type']))
+            values.append(action['value'])
+
+        if len(values) >= self._VECTORIZE_MIN_ACTIONS and None not in values:
+            # Long lists convert at C level; errors='raise' keeps the old
+            # reject-on-bad-value semantics, at field rather than item
+            # granularity
             try:
-                value = action['value']
-                if value is None and field_info.get('nullable', True):
-                    converted_value = None
-                else:
-                    # Convert to the appropriate type
-                    target_type = field_info['type']
-                    converted_value = target_type(str(value))
-                    
-                converted_actions.append({
-                    'action_type': str(action['action_type']),
-                    'value': converted_value
-                })
+                coerced = pd.to_numeric(pd.Series(values), errors='raise')
             except (ValueError, TypeError) as e:
-                raise ValueError(f"Failed to convert value in {field_name}[{idx}]: {str(e)}")
-        
-        return converted_actions
+                raise ValueError(f"Failed to convert values in {field_name}: {str(e)}")
+            if field_info['type'] == int:
+                if (coerced % 1 != 0).any():
+                    raise ValueError(f"Non-integer values in {field_name}")
+                converted_values = [int(v) for v in coerced]
+            else:
+                converted_values = [float(v) for v in coerced]
+        else:
+            convert = self._action_converters[field_name]
+            converted_values = []
+            for idx, value in enumerate(values):
+                try:
+                    converted_values.append(convert(value))
+                except (ValueError, TypeError) as e:
+                    raise ValueError(f"Failed to convert value in {field_name}[{idx}]: {str(e)}")
+
+        # Downstream (BigQuery nested RECORD columns) needs the AoS shape,
+        # so re-zip at the edge
+        return [
+            {'action_type': action_type, 'value': value}
+            for action_type, value in zip(types, converted_values)
+        ]
     
-    def validate_batch(self, 
-                      records: List[dict], 
+    def validate_batch(self,
+                      records: List[dict],
                       stop_on_first_error: bool = False) -> Dict[str, List[dict]]:
-        """Validate and categorize a batch of records
-        
+        """Validate, transform and categorize a batch of records
+
+        Scalar columns are validated and coerced with vectorized pandas
+        operations (pd.to_numeric / pd.to_datetime) instead of per-record
+        Python loops, so the interpreter work scales with the number of
+        columns rather than records. Nested action fields are ragged and
+        still go through the per-row converter.
+
         Args:
             records: List of records to validate
             stop_on_first_error: Whether to stop validation on first error
-            
+
         Returns:
             Dictionary with 'valid' and 'invalid' lists of records
         """
-        valid_records = []
-        invalid_records = []
-        
-        for record in records:
-            is_valid, issues = self.validate_record(record)
-            
-            if is_valid:
-                # Transform the record for BigQuery
-                transformed = self.transform_for_bigquery(record)
-                if transformed:
-                    valid_records.append(transformed)
-                else:
+        if not records:
+            return {'valid': [], 'invalid': []}
+
+        df = pd.DataFrame.from_records(records)
+        issues_by_row = defaultdict(list)
+
+        # Float columns: one C-level coercion per column; values that fail
+        # to parse become NaN while the original cell is non-null
+        for field in self.float_fields:
+            if field not in df.columns:
+                continue
+            coerced = None
+            if _fast_validate is not None:
+                # JIT kernel handles the common all-string column shape;
+                # returns None for mixed/null columns. Compilation can
+                # also raise outright (e.g. a numba TypingError on an
+                # unsupported dtype), which must degrade to pandas rather
+                # than fail the batch
+                try:
+                    coerced = _fast_validate.coerce_float_column(df[field])
+                except Exception as e:
+                    logger.debug(f"JIT float coercion failed for {field}, "
+                                 f"using pandas fallback: {str(e)}")
+            if coerced is None:
+                coerced = pd.to_numeric(df[field], errors='coerce')
+            for idx in df.index[coerced.isna() & df[field].notna()]:
+                issues_by_row[idx].append(f"Invalid float value in {field}: {df.at[idx, field]}")
+            # astype(object) boxes to Python floats, so the masked column
+            # is JSON-ready without a per-row rebuild
+            df[field] = coerced.astype(object).where(coerced.notna(), None)
+
+        # Integer columns: additionally reject values with a fractional part,
+        # matching the strictness of int(str(x))
+        for field in self.int_fields:
+            if field not in df.columns:
+                continue
+            coerced = pd.to_numeric(df[field], errors='coerce')
+            bad = (coerced.isna() & df[field].notna()) | (coerced.notna() & (coerced % 1 != 0))
+            for idx in df.index[bad]:
+                issues_by_row[idx].append(f"Invalid int value in {field}: {df.at[idx, field]}")
+            # Assign as an object Series explicitly: a bare list assignment
+            # re-infers float64 whenever any row is None, which would turn
+            # every int in the column back into a float
+            df[field] = pd.Series(
+                [None if pd.isna(v) else int(v) for v in coerced],
+                index=df.index, dtype=object
+            )
+
+        # Date columns: validate the fixed format in one pass, keep strings
+        for field in self.date_fields:
+            if field not in df.columns:
+                continue
+            parsed = pd.to_datetime(df[field], format='%Y-%m-%d', errors='coerce')
+            for idx in df.index[parsed.isna() & df[field].notna()]:
+                issues_by_row[idx].append(f"Invalid date value in {field}: {df.at[idx, field]}")
+            df[field] = [None if pd.isna(v) else str(v) for v in df[field]]
+
+        # Nested action fields: ragged lists of dicts, converted row by row
+        for field_name, field_info in self.action_fields.items():
+            if field_name not in df.columns:
+                continue
+            converted_column = []
+            for idx, value in zip(df.index, df[field_name]):
+                if value is None or (isinstance(value, float) and pd.isna(value)):
+                    converted_column.append(None)
+                    continue
+                try:
+                    converted_column.append(
+                        self._validate_and_convert_action_field(field_name, value, field_info)
+                    )
+                except ValueError as e:
+                    issues_by_row[idx].append(str(e))
+                    converted_column.append(None)
+            df[field_name] = converted_column
+
+        # Replace any remaining NaN/NaT (missing keys across records) with None
+        df = df.astype(object).where(df.notna(), None)
+
+        if not issues_by_row:
+            # Fast path for the common all-valid batch: no per-row
+            # categorization, the frame converts straight to records
+            valid_records = df.to_dict('records')
+            invalid_records = []
+        else:
+            valid_records = []
+            invalid_records = []
+            for i, transformed in enumerate(df.to_dict('records')):
+                if i in issues_by_row:
                     invalid_records.append({
-                        'record': record,
-                        'issues': ['Transformation failed']
+                        'record': records[i],
+                        'issues': issues_by_row[i]
                     })
-            else:
-                invalid_records.append({
-                    'record': record,
-                    'issues': issues
-                })
-                
-                if stop_on_first_error:
-                    break
-        
+                    if stop_on_first_error:
+                        break
+                else:
+                    valid_records.append(transformed)
+
         logger.info(f"Batch validation complete: {len(valid_records)} valid, {len(invalid_records)} invalid")
-        
+
         return {
             'valid': valid_records,
             'invalid': invalid_records
         }
     
+    def _arrow_type(self, info: Dict[str, Any]) -> pa.DataType:
+        """Map one schema entry to its Arrow type"""
+        if info.get('nested'):
+            value_type = pa.float64() if info['type'] == float else pa.int64()
+            return pa.list_(pa.struct([
+                ('action_type', pa.string()),
+                ('value', value_type)
+            ]))
+        if info['type'] == float:
+            return pa.float64()
+        if info['type'] == int:
+            return pa.int64()
+        if info['type'] == 'date':
+            return pa.date32()
+        return pa.string()
+
+    def transform_batch_to_arrow(self, records: List[dict]) -> pa.Table:
+        """Validate a batch and emit a typed Arrow table
+
+        The columnar result can go straight into a Parquet load job, so
+        the BigQuery client skips re-extracting columns from dicts.
+        Invalid records are dropped; call validate_batch directly when the
+        rejects are needed.
+
+        Args:
+            records: List of records to validate and convert
+
+        Returns:
+            pyarrow.Table with one typed column per schema field
+        """
+        valid_records = self.validate_batch(records)['valid']
+
+        columns = []
+        fields = []
+        for field_name, info in self.schema.items():
+            arrow_type = self._arrow_type(info)
+            values = [record.get(field_name) for record in valid_records]
+            if not info.get('nested') and info['type'] == 'date':
+                values = [date.fromisoformat(v) if v is not None else None for v in values]
+            columns.append(pa.array(values, type=arrow_type))
+            fields.append(pa.field(field_name, arrow_type))
+
+        return pa.Table.from_arrays(columns, schema=pa.schema(fields))
+
+    def validate_batch_parallel(self,
+                               records: List[dict],
+                               workers: int = None,
+                               chunksize: int = 250) -> Dict[str, List[dict]]:
+        """Validate a large batch across worker processes
+
+        Chunks are independent, so they fan out over a persistent
+        ProcessPoolExecutor for N-core scaling; the validator pickles as
+        just its schema and rebuilds its plans in each worker. The pool
+        is created on first use and reused across calls, so repeated
+        large batches don't re-pay worker spawn cost. Small batches stay
+        on the single-process path where fork/IPC overhead would dominate.
+        The default chunksize deliberately sits below the pipeline's
+        default batch_size of 1000, so a standard sync chunk splits into
+        four worker tasks instead of short-circuiting.
+
+        Args:
+            records: List of records to validate
+            workers: Number of worker processes (defaults to CPU count);
+                     only honored when the pool is first created
+            chunksize: Records per worker chunk
+
+        Returns:
+            Dictionary with 'valid' and 'invalid' lists of records
+        """
+        if len(records) <= chunksize:
+            return self.validate_batch(records)
+
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=workers or os.cpu_count()
+            )
+
+        chunks = (records[i:i + chunksize] for i in range(0, len(records), chunksize))
+
+        valid_records = []
+        invalid_records = []
+        for result in self._process_pool.map(self.validate_batch, chunks):
+            valid_records.extend(result['valid'])
+            invalid_records.extend(result['invalid'])
+
+        logger.info(f"Parallel batch validation complete: {len(valid_records)} valid, "
+                    f"{len(invalid_records)} invalid")
+
+        return {
+            'valid': valid_records,
+            'invalid': invalid_records
+        }
+
     def analyze_data_structure(self, records: List[dict]) -> Dict[str, Any]:
         """Analyze the structure of records to identify potential issues
         
@@ -218,25 +523,40 @@ class DataValidator:
         Returns:
             Dictionary with field type analysis and nested field identification
         """
-        field_types = defaultdict(set)
-        nested_fields = set()
-        
-        def analyze_value(key, value):
-            if isinstance(value, list) and value and isinstance(value[0], dict):
-                nested_fields.add(key)
-                for item in value:
-                    if 'action_type' in item and 'value' in item:
-                        field_types[f"{key}_values"].add(type(item['value']).__name__)
+        if not records:
+            return {
+                'field_types': {},
+                'nested_fields': [],
+                'total_records': 0,
+                'sample_record_keys': []
+            }
+
+        # Column-wise pandas maps replace the per-(record, key, value)
+        # Python loop; type lookups run once per column over C iteration
+        df = pd.DataFrame.from_records(records)
+        field_types = {}
+        nested_fields = []
+
+        for column in df.columns:
+            series = df[column].dropna()
+            nested_mask = series.map(
+                lambda v: isinstance(v, list) and bool(v) and isinstance(v[0], dict)
+            )
+            if nested_mask.any():
+                nested_fields.append(column)
+                value_types = set()
+                for actions in series[nested_mask]:
+                    for item in actions:
+                        if 'action_type' in item and 'value' in item:
+                            value_types.add(type(item['value']).__name__)
+                if value_types:
+                    field_types[f"{column}_values"] = list(value_types)
             else:
-                field_types[key].add(type(value).__name__)
-        
-        for record in records:
-            for key, value in record.items():
-                analyze_value(key, value)
-        
+                field_types[column] = list(set(series.map(lambda v: type(v).__name__)))
+
         return {
-            'field_types': {k: list(v) for k, v in field_types.items()},
-            'nested_fields': list(nested_fields),
+            'field_types': field_types,
+            'nested_fields': nested_fields,
             'total_records': len(records),
-            'sample_record_keys': list(records[0].keys()) if records else []
+            'sample_record_keys': list(records[0].keys())
         } 
\ No newline at end of file
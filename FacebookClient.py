@@ -1,28 +1,136 @@
+import asyncio
 import os
-import json
 import logging
+import threading
 import time
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from types import MappingProxyType
+from typing import List, Dict, Iterator, Optional
 from datetime import datetime, timedelta
+import httpx
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from facebook_business.api import FacebookAdsApi
 from facebook_business.adobjects.adaccount import AdAccount
+from facebook_business.adobjects.adreportrun import AdReportRun
 from facebook_business.adobjects.ad import Ad
 from facebook_business.exceptions import FacebookRequestError
 from dotenv import load_dotenv
 
+# orjson parses 2-5x faster than stdlib json; both libraries raise
+# ValueError subclasses on bad input so error handling stays the same
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    import json
+    _loads = json.loads
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Shared HTTP client for direct Graph API calls: keep-alive amortizes the
+# TLS handshake and DNS lookup across accounts instead of paying them per
+# request the way a bare requests.get does. The pool is sized for the
+# thread-pool fan-outs, and the transport retries dropped connections
+# (stale keep-alives, transient resets) before surfacing an error
+_HTTP = httpx.Client(
+    timeout=30.0,
+    limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+    transport=httpx.HTTPTransport(retries=3)
+)
+
+# Graph API error codes that signal throttling: 4/17 application and
+# account request limits, 32 page limits, 613 custom rate limits
+_RATE_LIMIT_ERROR_CODES = frozenset({4, 17, 32, 613})
+
+
+def _rate_limit_penalty(error: FacebookRequestError, attempt: int) -> Optional[float]:
+    """Seconds to back off before retrying a throttled call
+
+    Returns None when the error is not a rate limit. Prefers the server's
+    own estimate from the X-Business-Use-Case-Usage header (minutes until
+    access returns) over the blind exponential fallback.
+    """
+    if error.api_error_code() not in _RATE_LIMIT_ERROR_CODES:
+        return None
+
+    headers = error.http_headers() or {}
+    usage = headers.get('x-business-use-case-usage') or headers.get('X-Business-Use-Case-Usage')
+    if usage:
+        try:
+            worst = 0.0
+            for entries in _loads(usage).values():
+                for entry in entries:
+                    worst = max(worst, float(entry.get('estimated_time_to_regain_access', 0)) * 60.0)
+            if worst > 0:
+                return worst
+        except (ValueError, TypeError, AttributeError):
+            pass
+    return min(60.0, float(2 ** attempt))
+
+
+# Base params shared by every account-level insights call; the proxy is
+# read-only so call sites must spread it with their per-call additions
+_BASE_INSIGHT_PARAMS = MappingProxyType({
+    'level': 'ad',
+    'time_increment': 1,
+    'limit': 500,
+})
+
+# Per-ad insight calls address one ad node, so level/limit don't apply
+_PER_AD_INSIGHT_PARAMS = MappingProxyType({
+    'time_increment': 1,
+})
+
+# Fields requested from the customconversions edge
+_CUSTOM_CONVERSION_FIELDS = 'id,name,custom_event_type'
+
+
+class _RateLimiter:
+    """Thread-safe limiter enforcing a minimum gap between API calls
+
+    Replaces the per-chunk time.sleep so concurrent fetches still respect
+    the Graph API quota: each caller reserves the next available slot and
+    sleeps only until its own slot arrives.
+    """
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        if self.min_interval <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+    def penalize(self, seconds: float):
+        """Push the next available slot out for every caller
+
+        Used when the API reports throttling: one worker's penalty pauses
+        the whole pool instead of letting the others keep burning quota.
+        """
+        with self._lock:
+            self._next_slot = max(self._next_slot, time.monotonic() + seconds)
+
 
 class FacebookClient:
     """Handles all Facebook API interactions"""
     
-    # Comprehensive list of available fields for insights
-    INSIGHT_FIELDS = [
+    # Comprehensive list of available fields for insights; a tuple so the
+    # single source of truth cannot be mutated per call
+    INSIGHT_FIELDS = (
         # Metadata
         'account_id', 'account_name', 'account_currency',
-        'ad_id', 'ad_name', 'adset_id', 'adset_name', 
+        'ad_id', 'ad_name', 'adset_id', 'adset_name',
         'campaign_id', 'campaign_name',
         'date_start', 'date_stop',
 
@@ -53,8 +161,17 @@ class FacebookClient:
 
         # Objectives
         'objective', 'optimization_goal'
-    ]
-    
+    )
+
+    # Max ad IDs per account-level `filtering` request
+    AD_ID_FILTER_CHUNK = 1000
+
+    # Graph API batch requests accept up to 50 sub-requests per HTTP call
+    GRAPH_BATCH_SIZE = 50
+
+    # Ceiling for the exponential backoff while polling async report runs
+    ASYNC_POLL_MAX_WAIT = 60.0
+
     def __init__(self, access_token: str = None, app_id: str = None, app_secret: str = None):
         """Initialize Facebook API client
         
@@ -74,7 +191,67 @@ class FacebookClient:
         
         # Initialize Facebook API
         FacebookAdsApi.init(self.app_id, self.app_secret, self.access_token)
-    
+        self._mount_pooled_session(FacebookAdsApi.get_default_api())
+
+        # Per-account SDK objects and the default fields tuple are reused
+        # across calls instead of rebuilt per chunk
+        self._accounts: Dict[str, AdAccount] = {}
+        self._insight_fields = self.INSIGHT_FIELDS
+
+    @staticmethod
+    def _mount_pooled_session(api: FacebookAdsApi):
+        """Widen the SDK session's connection pool and add retries
+
+        The SDK routes every call through one requests.Session, but the
+        default adapter keeps only 10 pooled connections and never retries,
+        so parallel insight fetches reopen TLS connections and surface
+        transient 429/5xx errors to callers. Mounting a wider adapter with
+        urllib3 retries fixes both; the session lives on SDK internals, so
+        failure here is logged and tolerated rather than fatal.
+        """
+        try:
+            session = api._session.requests
+            adapter = HTTPAdapter(
+                pool_connections=16,
+                pool_maxsize=16,
+                max_retries=Retry(
+                    total=5,
+                    backoff_factor=0.5,
+                    status_forcelist=(429, 500, 502, 503, 504)
+                )
+            )
+            session.mount('https://', adapter)
+        except AttributeError as e:
+            logger.warning(f"Could not mount pooled session on Facebook SDK: {e}")
+
+    def _call_with_rate_limit_retry(self, limiter: _RateLimiter,
+                                    description: str, func):
+        """Run an API call with shared pacing and throttle-aware retries
+
+        Waits for the limiter slot, then on a rate-limit error backs the
+        whole pool off by the server's estimate (or exponentially) and
+        retries up to three times. Non-throttle errors propagate untouched.
+        """
+        attempt = 0
+        while True:
+            limiter.wait()
+            try:
+                return func()
+            except FacebookRequestError as e:
+                penalty = _rate_limit_penalty(e, attempt)
+                if penalty is None or attempt >= 3:
+                    raise
+                logger.warning(f"Rate limited on {description}; backing off {penalty:.0f}s")
+                limiter.penalize(penalty)
+                attempt += 1
+
+    def _account(self, ad_account_id: str) -> AdAccount:
+        """Get (and cache) the AdAccount object for an account ID"""
+        account = self._accounts.get(ad_account_id)
+        if account is None:
+            account = self._accounts[ad_account_id] = AdAccount(ad_account_id)
+        return account
+
     def get_ad_account_ids(self) -> List[str]:
         """Parse and return ad account IDs from environment or config"""
         ad_account_ids = os.getenv('FB_AD_ACCOUNT_ID')
@@ -82,8 +259,8 @@ class FacebookClient:
         if ad_account_ids:
             logger.info(f"AD_ACCOUNT_ID: {ad_account_ids}")
             try:
-                return json.loads(ad_account_ids)
-            except json.JSONDecodeError:
+                return _loads(ad_account_ids)
+            except ValueError:
                 logger.error(f"Failed to parse AD_ACCOUNT_ID: {ad_account_ids}")
                 raise ValueError("Invalid JSON format for AD_ACCOUNT_ID")
         else:
@@ -91,33 +268,209 @@ class FacebookClient:
     
     def get_all_ad_ids(self, ad_account_ids: List[str] = None) -> List[str]:
         """Extract all ad IDs from specified ad accounts
-        
+
+        Accounts are independent, paginated pulls, so they overlap on a
+        small thread pool instead of running back to back.
+
         Args:
             ad_account_ids: List of ad account IDs (defaults to env var)
-            
+
         Returns:
             List of all ad IDs found
         """
         if ad_account_ids is None:
             ad_account_ids = self.get_ad_account_ids()
-        
-        all_ad_ids = []
-        
-        for ad_account_id in ad_account_ids:
-            account = AdAccount(ad_account_id)
+
+        def fetch_account(ad_account_id: str) -> List[str]:
+            account = self._account(ad_account_id)
             ads = account.get_ads(
-                fields=['id', 'name'],
+                fields=['id'],
                 params={'limit': 1000}
             )
-            
-            for ad in ads:
-                all_ad_ids.append(ad['id'])
-                logger.info(f"Found ad: {ad['name']} (ID: {ad['id']})")
-        
+
+            # The comprehension drives the cursor's pagination to completion
+            account_ad_ids = [ad['id'] for ad in ads]
+            logger.debug(f"Found {len(account_ad_ids)} ads in account {ad_account_id}")
+            return account_ad_ids
+
+        all_ad_ids = []
+        # ≤4 workers: same bound as the insight fetch pools, keeping total
+        # Graph API pressure predictable
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            for account_ad_ids in executor.map(fetch_account, ad_account_ids):
+                all_ad_ids.extend(account_ad_ids)
+
+        # Order-preserving dedupe: an ad surfacing in more than one query
+        # would otherwise cost duplicate insight requests downstream
+        all_ad_ids = list(dict.fromkeys(all_ad_ids))
+
         logger.info(f"Total ads found: {len(all_ad_ids)}")
         return all_ad_ids
     
-    def get_insights(self, 
+    def get_insights_for_ad_ids(self,
+                                ad_account_id: str,
+                                ad_ids: List[str],
+                                time_range: Dict[str, str] = None,
+                                fields: List[str] = None) -> List[dict]:
+        """Fetch insights for a specific set of ads in one account
+
+        Instead of one request per ad, the ad IDs are pushed through the
+        account-level `filtering` param in chunks, so N ads cost
+        O(N / AD_ID_FILTER_CHUNK) paged requests.
+
+        Args:
+            ad_account_id: Facebook ad account ID
+            ad_ids: Ad IDs to fetch insights for
+            time_range: Dict with 'since' and 'until' dates (format: 'YYYY-MM-DD')
+                       If None, defaults to last 30 days
+            fields: List of fields to retrieve (defaults to INSIGHT_FIELDS)
+
+        Returns:
+            List of insights data for the requested ads
+        """
+        if not ad_ids:
+            return []
+
+        # Duplicate IDs would inflate the filter chunks and re-fetch rows
+        ad_ids = list(dict.fromkeys(ad_ids))
+
+        if fields is None:
+            fields = self._insight_fields
+
+        account = self._account(ad_account_id)
+        insights_data = []
+
+        for start in range(0, len(ad_ids), self.AD_ID_FILTER_CHUNK):
+            chunk = ad_ids[start:start + self.AD_ID_FILTER_CHUNK]
+            params = {
+                **_BASE_INSIGHT_PARAMS,
+                'filtering': [{'field': 'ad.id', 'operator': 'IN', 'value': chunk}],
+            }
+            if time_range:
+                params['time_range'] = time_range
+            else:
+                params['date_preset'] = 'last_30d'
+
+            try:
+                insights = account.get_insights(fields=fields, params=params)
+                insights_data.extend(insight._data for insight in insights)
+            except FacebookRequestError as e:
+                logger.error(f"  ❌ Facebook API error for ad ID chunk starting at {start}: {e}")
+                continue
+            except Exception as e:
+                logger.error(f"  ❌ Error for ad ID chunk starting at {start}: {e}")
+                continue
+
+        logger.info(f"Got {len(insights_data)} insights for {len(ad_ids)} ads")
+        return insights_data
+
+    def get_insights_per_ad(self,
+                            ad_ids: List[str],
+                            time_range: Dict[str, str] = None,
+                            fields: List[str] = None,
+                            delay_between_batches: float = 0.2) -> List[dict]:
+        """Fetch insights ad-by-ad using Graph API HTTP batching
+
+        Fallback for ads that cannot go through account-level filtering.
+        Sub-requests are grouped GRAPH_BATCH_SIZE per HTTP call via
+        FacebookAdsApi.new_batch(), so N ads cost N/50 HTTPS round-trips
+        instead of N; the batch calls themselves overlap on a small
+        thread pool paced by the shared rate limiter. Sub-requests that
+        fail inside an otherwise-successful batch (transient per-ad
+        errors don't fail the HTTP call) get one retry pass before being
+        counted as lost.
+
+        Args:
+            ad_ids: Ad IDs to fetch insights for
+            time_range: Dict with 'since' and 'until' dates (format: 'YYYY-MM-DD')
+                       If None, defaults to last 30 days
+            fields: List of fields to retrieve (defaults to INSIGHT_FIELDS)
+            delay_between_batches: Minimum gap between batch submissions
+
+        Returns:
+            List of insights data for the requested ads
+        """
+        if not ad_ids:
+            return []
+
+        # Duplicate IDs would waste batch sub-requests on repeat fetches
+        ad_ids = list(dict.fromkeys(ad_ids))
+
+        if fields is None:
+            fields = self._insight_fields
+
+        params = dict(_PER_AD_INSIGHT_PARAMS)
+        if time_range:
+            params['time_range'] = time_range
+        else:
+            params['date_preset'] = 'last_30d'
+
+        api = FacebookAdsApi.get_default_api()
+        limiter = _RateLimiter(delay_between_batches)
+
+        def fetch_batch(chunk: List[str]):
+            """Execute one 50-sub-request batch; returns (rows, failed_ids)"""
+
+            def attempt():
+                # Fresh accumulators per attempt so a retried batch cannot
+                # double-count rows collected before the HTTP call failed
+                rows = []
+                failed_ids = []
+
+                def on_success(response):
+                    rows.extend(response.json().get('data', []))
+
+                api_batch = api.new_batch()
+                for ad_id in chunk:
+                    def on_failure(response, ad_id=ad_id):
+                        failed_ids.append(ad_id)
+                        # Per-sub-request detail only on DEBUG; failures
+                        # surface through the aggregated warning below
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug(f"Batch sub-request for ad {ad_id} failed: {response.error()}")
+
+                    Ad(ad_id).get_insights(
+                        fields=fields,
+                        params=params,
+                        batch=api_batch,
+                        success=on_success,
+                        failure=on_failure
+                    )
+                api_batch.execute()
+                return rows, failed_ids
+
+            return self._call_with_rate_limit_retry(
+                limiter, f"batch of {len(chunk)} ads", attempt)
+
+        def fetch_all(ids: List[str]):
+            """Fan batches of ids out over the pool; returns (rows, failed_ids)"""
+            chunks = [ids[start:start + self.GRAPH_BATCH_SIZE]
+                      for start in range(0, len(ids), self.GRAPH_BATCH_SIZE)]
+            rows = []
+            failed_ids = []
+            # ≤4 workers: same ceiling as the chunked date-range fetches,
+            # RTT overlap without crowding the per-token rate limit
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                futures = [executor.submit(fetch_batch, chunk) for chunk in chunks]
+                for future in as_completed(futures):
+                    chunk_rows, chunk_failed = future.result()
+                    rows.extend(chunk_rows)
+                    failed_ids.extend(chunk_failed)
+            return rows, failed_ids
+
+        insights_data, failed_ids = fetch_all(ad_ids)
+
+        if failed_ids:
+            logger.info(f"Retrying {len(failed_ids)} failed per-ad requests")
+            retry_rows, failed_ids = fetch_all(failed_ids)
+            insights_data.extend(retry_rows)
+
+        if failed_ids:
+            logger.warning(f"{len(failed_ids)} of {len(ad_ids)} per-ad requests failed after retry")
+        logger.info(f"Got {len(insights_data)} insights for {len(ad_ids)} ads via batched requests")
+        return insights_data
+
+    def get_insights(self,
                     ad_account_ids: List[str] = None,
                     time_range: Dict[str, str] = None,
                     chunk_days: int = 7,
@@ -136,19 +489,160 @@ class FacebookClient:
         Returns:
             List of insights data for all ads
         """
+        return self._deduplicate_insights(list(self.iter_insights(
+            ad_account_ids=ad_account_ids,
+            time_range=time_range,
+            chunk_days=chunk_days,
+            delay_between_chunks=delay_between_chunks,
+            fields=fields
+        )))
+
+    def iter_insights(self,
+                     ad_account_ids: List[str] = None,
+                     time_range: Dict[str, str] = None,
+                     chunk_days: int = 7,
+                     delay_between_chunks: float = 0.2,
+                     fields: List[str] = None) -> Iterator[dict]:
+        """Stream insights as they arrive instead of materializing a list
+
+        Same arguments as get_insights. Records are yielded per API page,
+        so callers can validate/upload in bounded batches regardless of the
+        date range. Note: records are not deduplicated across chunk
+        boundaries here; get_insights wraps this with deduplication, and
+        streaming consumers should dedupe downstream (BigQueryClient
+        already drops duplicate merge keys).
+        """
         if ad_account_ids is None:
             ad_account_ids = self.get_ad_account_ids()
-            
+
         if fields is None:
-            fields = self.INSIGHT_FIELDS
-        
+            fields = self._insight_fields
+
         if time_range:
-            return self._get_insights_date_range(
+            yield from self._iter_insights_date_range(
                 ad_account_ids, time_range, chunk_days, delay_between_chunks, fields
             )
         else:
-            return self._get_insights_bulk(ad_account_ids, fields)
+            yield from self._iter_insights_bulk(ad_account_ids, fields)
     
+    def run_async_insights(self,
+                           ad_account_id: str,
+                           fields: List[str] = None,
+                           params: Dict = None) -> AdReportRun:
+        """Start a server-side async insights report run for an account
+
+        Async jobs are built for bulk pulls: they never hit the synchronous
+        request timeout and barely count against the rate limit while the
+        server prepares the result.
+
+        Args:
+            ad_account_id: Facebook ad account ID
+            fields: List of fields to retrieve (defaults to INSIGHT_FIELDS)
+            params: Insights params (defaults to the shared base params)
+
+        Returns:
+            The AdReportRun handle to poll for completion
+        """
+        account = self._account(ad_account_id)
+        return account.get_insights(
+            fields=fields or self._insight_fields,
+            params=params or dict(_BASE_INSIGHT_PARAMS),
+            is_async=True
+        )
+
+    def get_insights_async(self,
+                           ad_account_ids: List[str] = None,
+                           time_range: Dict[str, str] = None,
+                           fields: List[str] = None) -> List[dict]:
+        """Fetch insights through async report runs, one per account
+
+        Each account's run is started immediately, then polled with
+        exponential backoff until the job completes; accounts overlap on
+        the same small thread pool the synchronous paths use. Prefer this
+        over get_insights for large accounts where synchronous calls time
+        out or trip the rate limiter.
+
+        Args:
+            ad_account_ids: List of ad account IDs (defaults to env var)
+            time_range: Dict with 'since' and 'until' dates (format: 'YYYY-MM-DD')
+                       If None, defaults to last 30 days
+            fields: List of fields to retrieve (defaults to INSIGHT_FIELDS)
+
+        Returns:
+            List of insights data for all ads in the accounts
+        """
+        if ad_account_ids is None:
+            ad_account_ids = self.get_ad_account_ids()
+
+        if fields is None:
+            fields = self._insight_fields
+
+        params = dict(_BASE_INSIGHT_PARAMS)
+        if time_range:
+            params['time_range'] = time_range
+        else:
+            params['date_preset'] = 'last_30d'
+
+        def run_one(ad_account_id: str) -> List[dict]:
+            try:
+                report_run = self.run_async_insights(ad_account_id, fields, params)
+
+                wait = 1.0
+                while True:
+                    report_run = report_run.api_get()
+                    status = report_run[AdReportRun.Field.async_status]
+                    if status == 'Job Completed':
+                        break
+                    if status in ('Job Failed', 'Job Skipped'):
+                        logger.error(f"Async report run for {ad_account_id} ended with status: {status}")
+                        return []
+                    time.sleep(wait)
+                    wait = min(self.ASYNC_POLL_MAX_WAIT, wait * 2)
+
+                return [insight._data
+                        for insight in report_run.get_insights(params={'limit': 500})]
+            except FacebookRequestError as e:
+                logger.error(f"Facebook API error in async run for {ad_account_id}: {e}")
+            except Exception as e:
+                logger.error(f"Error in async run for {ad_account_id}: {e}")
+            return []
+
+        insights_data = []
+        # ≤4 workers: polling is idle time, so runs overlap cheaply while
+        # result downloads stay within the per-token pacing
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(run_one, account_id)
+                       for account_id in ad_account_ids]
+            for future in as_completed(futures):
+                insights_data.extend(future.result())
+
+        logger.info(f"Got {len(insights_data)} insights from {len(ad_account_ids)} async report runs")
+        return insights_data
+
+    def get_all_ads_insights_bulk(self,
+                                  ad_account_ids: List[str] = None,
+                                  fields: List[str] = None) -> List[dict]:
+        """Fetch last-30-day insights with one account-level call per account
+
+        Direct entry point to the bulk path: no per-ad requests, no date
+        chunking — each account costs one paginated Graph API call at
+        level=ad. Use get_insights for explicit date ranges.
+
+        Args:
+            ad_account_ids: List of ad account IDs (defaults to env var)
+            fields: List of fields to retrieve (defaults to INSIGHT_FIELDS)
+
+        Returns:
+            List of insights data for all ads in the accounts
+        """
+        if ad_account_ids is None:
+            ad_account_ids = self.get_ad_account_ids()
+
+        if fields is None:
+            fields = self._insight_fields
+
+        return list(self._iter_insights_bulk(ad_account_ids, fields))
+
     def _deduplicate_insights(self, insights: List[dict]) -> List[dict]:
         """Deduplicate insights based on key fields (ad_id, date_start, account_id)
         
@@ -194,103 +688,125 @@ class FacebookClient:
         
         return deduplicated
     
-    def _get_insights_bulk(self, ad_account_ids: List[str], fields: List[str]) -> List[dict]:
-        """Fetch insights for ALL ads in accounts with minimal API calls"""
-        params = {
-            'date_preset': 'last_30d',
-            'level': 'ad',
-            'time_increment': 1,
-            'limit': 500,
-        }
-        
-        all_insights = []
-        
-        for ad_account_id in ad_account_ids:
-            logger.info(f"Processing {ad_account_id}...")
-            
+    def _iter_insights_bulk(self, ad_account_ids: List[str], fields: List[str]) -> Iterator[dict]:
+        """Yield insights for ALL ads in accounts with minimal API calls
+
+        Accounts run concurrently on a small thread pool and yield as each
+        finishes; a single slow account no longer serializes the rest. The
+        trade-off (one account's rows held in memory at a time instead of
+        one SDK page) matches the date-range path.
+        """
+        params = {**_BASE_INSIGHT_PARAMS, 'date_preset': 'last_30d'}
+
+        def fetch_account(ad_account_id: str) -> List[dict]:
+            logger.debug(f"Processing {ad_account_id}...")
             try:
-                account = AdAccount(ad_account_id)
+                account = self._account(ad_account_id)
                 insights = account.get_insights(fields=fields, params=params)
-                
-                # Convert to list - SDK handles pagination
-                account_insights = [dict(insight) for insight in insights]
-                all_insights.extend(account_insights)
-                
-                logger.info(f"  ✅ Got {len(account_insights)} insights")
-                
+
+                # _data is the already-built payload dict; dict(insight)
+                # would re-hash every key through AbstractObject.__iter__
+                account_insights = [insight._data for insight in insights]
+                logger.debug(f"  ✅ Got {len(account_insights)} insights for {ad_account_id}")
+                return account_insights
+
             except FacebookRequestError as e:
                 logger.error(f"  ❌ Facebook API error: {e}")
-                continue
             except Exception as e:
                 logger.error(f"  ❌ Error: {e}")
-                continue
-        
-        logger.info(f"🎉 Total: {len(all_insights)} insights")
-        return self._deduplicate_insights(all_insights)
-    
-    def _get_insights_date_range(self,
+            return []
+
+        total = 0
+        # ≤4 workers: network-bound calls overlap while staying well inside
+        # Facebook's per-app concurrency comfort zone
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(fetch_account, account_id)
+                       for account_id in ad_account_ids]
+            for future in as_completed(futures):
+                account_insights = future.result()
+                total += len(account_insights)
+                yield from account_insights
+
+        logger.info(f"🎉 Total: {total} insights")
+
+    def _iter_insights_date_range(self,
                                 ad_account_ids: List[str],
                                 time_range: Dict[str, str],
                                 chunk_days: int,
                                 delay_between_chunks: float,
-                                fields: List[str]) -> List[dict]:
-        """Fetch insights for a specific date range, split into chunks"""
+                                fields: List[str]) -> Iterator[dict]:
+        """Yield insights for a specific date range, split into chunks
+
+        Each (chunk, account) pair is an independent Graph API call, so
+        they run concurrently on a small thread pool; a shared rate
+        limiter keeps the aggregate request rate at the same pace the old
+        serial loop with time.sleep enforced.
+        """
         # Parse dates
         start_date = datetime.strptime(time_range['since'], '%Y-%m-%d')
         end_date = datetime.strptime(time_range['until'], '%Y-%m-%d')
-        
+
         total_days = (end_date - start_date).days + 1
-        
+
         logger.info(f"📅 Date range: {time_range['since']} to {time_range['until']} ({total_days} days)")
         logger.info(f"📦 Splitting into {chunk_days}-day chunks with 1-day overlap")
-        
-        all_insights = []
+
+        # Build the full (chunk, account) job list up front
+        jobs = []
         chunk_count = 0
         current_start = start_date
-        
         while current_start <= end_date:
             chunk_end = min(current_start + timedelta(days=chunk_days - 1), end_date)
-            
             chunk_time_range = {
                 'since': current_start.strftime('%Y-%m-%d'),
                 'until': chunk_end.strftime('%Y-%m-%d')
             }
-            
             chunk_count += 1
-            logger.info(f"\n📦 Chunk {chunk_count}: {chunk_time_range['since']} to {chunk_time_range['until']}")
-            
             for ad_account_id in ad_account_ids:
-                logger.info(f"  Processing account {ad_account_id}...")
-                
-                try:
-                    params = {
-                        'time_range': chunk_time_range,
-                        'level': 'ad',
-                        'time_increment': 1,
-                        'limit': 500,
-                    }
-                    
-                    account = AdAccount(ad_account_id)
-                    insights = account.get_insights(fields=fields, params=params)
-                    
-                    chunk_insights = [dict(insight) for insight in insights]
-                    all_insights.extend(chunk_insights)
-                    
-                    logger.info(f"    ✅ Got {len(chunk_insights)} insights")
-                    
-                except FacebookRequestError as e:
-                    logger.error(f"    ❌ Facebook API error: {e}")
-                except Exception as e:
-                    logger.error(f"    ❌ Error: {e}")
-            
+                jobs.append((chunk_count, chunk_time_range, ad_account_id))
             current_start = current_start + timedelta(days=chunk_days - 1)
-            
-            if current_start <= end_date and delay_between_chunks > 0:
-                logger.info(f"  ⏳ Waiting {delay_between_chunks}s before next chunk...")
-                time.sleep(delay_between_chunks)
-        
-        logger.info(f"✅ Fetched {len(all_insights)} total insights")
-        return self._deduplicate_insights(all_insights)
+
+        limiter = _RateLimiter(delay_between_chunks)
+
+        def fetch_chunk(chunk_num: int, chunk_time_range: Dict[str, str], ad_account_id: str) -> List[dict]:
+            # Per-(chunk, account) progress is DEBUG only: at scale the
+            # formatting plus stderr I/O is a measurable per-call tax
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"📦 Chunk {chunk_num} ({chunk_time_range['since']} to "
+                             f"{chunk_time_range['until']}): processing account {ad_account_id}...")
+            try:
+                params = {**_BASE_INSIGHT_PARAMS, 'time_range': chunk_time_range}
+
+                account = self._account(ad_account_id)
+
+                # _data avoids the per-key re-hash that dict(insight) costs;
+                # the SDK builds a fresh object per row so no copy is needed
+                chunk_insights = self._call_with_rate_limit_retry(
+                    limiter,
+                    f"chunk {chunk_num} for account {ad_account_id}",
+                    lambda: [insight._data
+                             for insight in account.get_insights(fields=fields, params=params)]
+                )
+                logger.debug(f"    ✅ Got {len(chunk_insights)} insights")
+                return chunk_insights
+
+            except FacebookRequestError as e:
+                logger.error(f"    ❌ Facebook API error: {e}")
+            except Exception as e:
+                logger.error(f"    ❌ Error: {e}")
+            return []
+
+        total = 0
+        # ≤4 workers: network-bound calls overlap while staying well inside
+        # Facebook's per-app concurrency comfort zone
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(fetch_chunk, *job) for job in jobs]
+            for future in as_completed(futures):
+                chunk_insights = future.result()
+                total += len(chunk_insights)
+                yield from chunk_insights
+
+        logger.info(f"✅ Fetched {total} total insights")
     
     def get_custom_conversions(self, ad_account_id: str) -> List[dict]:
         """Fetch custom conversions for a specific ad account
@@ -301,36 +817,85 @@ class FacebookClient:
         Returns:
             List of custom conversion mappings
         """
-        # Ensure we have the 'act_' prefix for the API call
-        if not ad_account_id.startswith('act_'):
-            formatted_account_id = f"act_{ad_account_id}"
-        else:
-            formatted_account_id = ad_account_id
-        
+        formatted_account_id = self._format_account_id(ad_account_id)
         url = f"https://graph.facebook.com/v18.0/{formatted_account_id}/customconversions"
         params = {
             'access_token': self.access_token,
-            'fields': 'id,name,custom_event_type'
+            'fields': _CUSTOM_CONVERSION_FIELDS
         }
-        
+
         try:
-            import requests
-            response = requests.get(url, params=params)
+            response = _HTTP.get(url, params=params)
             response.raise_for_status()
             data = response.json()
-            
-            custom_mappings = []
-            for conversion in data.get('data', []):
-                custom_mappings.append({
-                    'user_friendly_name': conversion['name'],
-                    'meta_action_type': f"offsite_conversion.custom.{conversion['id']}",
-                    'mapping_type': 'custom',
-                    'ad_account_id': ad_account_id.replace('act_', ''),
-                    'facebook_conversion_id': conversion['id']
-                })
-            
-            return custom_mappings
-            
+            return self._custom_conversion_rows(ad_account_id, data)
         except Exception as e:
             logger.error(f"Error fetching custom conversions for account {formatted_account_id}: {e}")
-            return [] 
\ No newline at end of file
+            return []
+
+    async def get_custom_conversions_many(self,
+                                          ad_account_ids: List[str],
+                                          concurrency: int = 16) -> Dict[str, List[dict]]:
+        """Fetch custom conversions for many accounts concurrently
+
+        Async variant of get_custom_conversions for the FastAPI path: all
+        accounts share one AsyncClient and run under a semaphore, so wall
+        time is the slowest request rather than the sum, while concurrent
+        Graph API pressure stays bounded.
+
+        Args:
+            ad_account_ids: Facebook ad account IDs
+            concurrency: Maximum in-flight requests
+
+        Returns:
+            Dict mapping each account ID to its custom conversion mappings
+        """
+        sem = asyncio.Semaphore(concurrency)
+
+        async def fetch_one(client: httpx.AsyncClient, ad_account_id: str):
+            formatted_account_id = self._format_account_id(ad_account_id)
+            url = f"https://graph.facebook.com/v18.0/{formatted_account_id}/customconversions"
+            params = {
+                'access_token': self.access_token,
+                'fields': _CUSTOM_CONVERSION_FIELDS
+            }
+            async with sem:
+                try:
+                    response = await client.get(url, params=params)
+                    response.raise_for_status()
+                    data = response.json()
+                    return ad_account_id, self._custom_conversion_rows(ad_account_id, data)
+                except Exception as e:
+                    logger.error(f"Error fetching custom conversions for account {formatted_account_id}: {e}")
+                    return ad_account_id, []
+
+        async with httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=concurrency)
+        ) as client:
+            results = await asyncio.gather(
+                *[fetch_one(client, account_id) for account_id in ad_account_ids]
+            )
+
+        return dict(results)
+
+    @staticmethod
+    def _format_account_id(ad_account_id: str) -> str:
+        """Ensure the 'act_' prefix required by Graph API account paths"""
+        if ad_account_id.startswith('act_'):
+            return ad_account_id
+        return f"act_{ad_account_id}"
+
+    @staticmethod
+    def _custom_conversion_rows(ad_account_id: str, data: dict) -> List[dict]:
+        """Shape a customconversions API payload into mapping rows"""
+        return [
+            {
+                'user_friendly_name': conversion['name'],
+                'meta_action_type': f"offsite_conversion.custom.{conversion['id']}",
+                'mapping_type': 'custom',
+                'ad_account_id': ad_account_id.replace('act_', ''),
+                'facebook_conversion_id': conversion['id']
+            }
+            for conversion in data.get('data', [])
+        ] 
\ No newline at end of file
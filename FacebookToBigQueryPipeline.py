@@ -1,5 +1,9 @@
+import gzip
 import logging
-import json
+import orjson
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from typing import List, Dict, Optional, Any
 from datetime import datetime, timedelta
 
@@ -12,6 +16,11 @@ from Config import Config
 
 logger = logging.getLogger(__name__)
 
+# Initialized pipelines keyed by config identity, so repeated convenience
+# calls (e.g. per-date-range backfills) reuse clients instead of
+# re-parsing env config and re-handshaking with BigQuery
+_PIPELINE_CACHE: Dict[Any, 'FacebookToBigQueryPipeline'] = {}
+
 
 class FacebookToBigQueryPipeline:
     """Main orchestrator for the Facebook to BigQuery ETL pipeline"""
@@ -30,7 +39,28 @@ class FacebookToBigQueryPipeline:
         
         # Initialize components
         self._initialize_components()
-    
+
+    @classmethod
+    def for_config(cls, config: Config = None) -> 'FacebookToBigQueryPipeline':
+        """Get or create a pipeline instance for a configuration
+
+        Instances are cached by config identity (None for the default env
+        config); the cache entry keeps the config alive, so its id stays
+        stable for the lifetime of the pipeline.
+
+        Args:
+            config: Configuration object (defaults to loading from environment)
+
+        Returns:
+            A shared FacebookToBigQueryPipeline for this configuration
+        """
+        key = None if config is None else id(config)
+        pipeline = _PIPELINE_CACHE.get(key)
+        if pipeline is None:
+            pipeline = cls(config)
+            _PIPELINE_CACHE[key] = pipeline
+        return pipeline
+
     def _initialize_components(self):
         """Initialize all pipeline components"""
         # Core clients
@@ -42,7 +72,8 @@ class FacebookToBigQueryPipeline:
         
         self.bq_client = BigQueryClient(
             credentials_json=self.config.bigquery.credentials_json,
-            project_id=self.config.bigquery.project_id
+            project_id=self.config.bigquery.project_id,
+            max_concurrent_loads=self.config.pipeline.load_concurrency
         )
         
         # Get schema for validation
@@ -51,6 +82,15 @@ class FacebookToBigQueryPipeline:
         
         # Business logic components
         self.kpi_manager = KPIMappingManager(self.fb_client, self.bq_client)
+
+        # Single background writer for debug dumps, so disk I/O overlaps
+        # pipeline work; the interpreter joins it on shutdown
+        self._io_pool = ThreadPoolExecutor(max_workers=1)
+
+        # One upload slot: the previous chunk loads into BigQuery while the
+        # next one is fetched and validated, keeping at most two chunks in
+        # memory and per-chunk upload ordering intact
+        self._upload_pool = ThreadPoolExecutor(max_workers=1)
     
     def run_full_sync(self, 
                      time_range: Dict[str, str] = None,
@@ -66,9 +106,10 @@ class FacebookToBigQueryPipeline:
             Dictionary with execution results and statistics
         """
         logger.info("Starting full sync pipeline")
-        start_time = datetime.now()
+        # Monotonic clock for the duration; wall clock only for the report
+        start_ns = time.monotonic_ns()
         results = {
-            'start_time': start_time.isoformat(),
+            'start_time': datetime.now().isoformat(),
             'status': 'started',
             'steps': {}
         }
@@ -86,84 +127,118 @@ class FacebookToBigQueryPipeline:
                 logger.info("Step 1: Skipping KPI mapping update")
                 results['steps']['kpi_mappings'] = {'status': 'skipped'}
             
-            # Step 2: Fetch Facebook insights
+            # Steps 2-4: Stream insights through validation and upload in
+            # batch_size chunks instead of materializing the full pull
             logger.info("Step 2: Fetching Facebook insights")
-            insights = self.fb_client.get_insights(
+            insight_iter = self.fb_client.iter_insights(
                 ad_account_ids=self.config.facebook.ad_account_ids,
                 time_range=time_range,
                 chunk_days=self.config.pipeline.chunk_days,
                 delay_between_chunks=self.config.pipeline.delay_between_chunks
             )
-            
+
+            total_fetched = 0
+            total_valid = 0
+            total_invalid = 0
+            all_invalid_records = []
+            total_processed = 0
+            total_rows_affected = 0
+            upload_status = 'skipped'
+            upload_methods = set()
+            pending_upload = None
+
+            def record_upload(upload_results: Dict[str, Any]):
+                nonlocal upload_status, total_processed, total_rows_affected
+                upload_status = upload_results.get('status', 'success')
+                total_processed += upload_results.get('processed', 0)
+                total_rows_affected += upload_results.get('rows_affected', 0)
+                if 'method' in upload_results:
+                    upload_methods.add(upload_results['method'])
+
+            while True:
+                chunk = list(islice(insight_iter, self.config.pipeline.batch_size))
+                if not chunk:
+                    break
+                total_fetched += len(chunk)
+
+                # Step 3: Validate and transform data; oversized chunks
+                # fan out across the validator's process pool
+                if self.config.pipeline.enable_validation:
+                    validation_results = self.validator.validate_batch_parallel(chunk)
+
+                    valid_records = validation_results['valid']
+                    total_valid += len(valid_records)
+                    total_invalid += len(validation_results['invalid'])
+                    all_invalid_records.extend(validation_results['invalid'])
+
+                    insights_to_upload = valid_records
+                else:
+                    insights_to_upload = chunk
+
+                # Step 4: Upload to BigQuery, overlapped with fetching the
+                # next chunk; settling the previous upload first bounds the
+                # pipeline at one chunk in flight
+                if not dry_run and insights_to_upload:
+                    if pending_upload is not None:
+                        record_upload(pending_upload.result())
+                    pending_upload = self._upload_pool.submit(
+                        self.bq_client.insert_records,
+                        dataset_id=self.config.bigquery.dataset_id,
+                        table_id=self.config.bigquery.meta_ads_table,
+                        records=insights_to_upload,
+                        batch_size=self.config.pipeline.batch_size,
+                        streaming_threshold=self.config.pipeline.streaming_threshold
+                    )
+
+            if pending_upload is not None:
+                record_upload(pending_upload.result())
+
             results['steps']['fetch_insights'] = {
                 'status': 'success',
-                'total_records': len(insights)
+                'total_records': total_fetched
             }
-            
-            if not insights:
+
+            if not total_fetched:
                 logger.warning("No insights data retrieved")
                 results['status'] = 'completed_no_data'
                 return results
-            
-            # Step 3: Validate and transform data
+
             if self.config.pipeline.enable_validation:
-                logger.info("Step 3: Validating and transforming data")
-                validation_results = self.validator.validate_batch(insights)
-                
-                valid_records = validation_results['valid']
-                invalid_records = validation_results['invalid']
-                
                 results['steps']['validation'] = {
                     'status': 'success',
-                    'valid_records': len(valid_records),
-                    'invalid_records': len(invalid_records)
+                    'valid_records': total_valid,
+                    'invalid_records': total_invalid
                 }
-                
-                if invalid_records:
-                    # Save invalid records for debugging
-                    self._save_invalid_records(invalid_records)
-                
-                insights_to_upload = valid_records
+
+                if all_invalid_records:
+                    # Save invalid records for debugging off the main thread
+                    self._io_pool.submit(self._save_invalid_records, all_invalid_records)
             else:
                 logger.info("Step 3: Skipping validation")
-                insights_to_upload = insights
                 results['steps']['validation'] = {'status': 'skipped'}
-            
-            # Step 4: Upload to BigQuery
-            if not dry_run and insights_to_upload:
-                logger.info("Step 4: Uploading to BigQuery")
-                table_id = self.config.bigquery.get_full_table_id(
-                    self.config.bigquery.meta_ads_table
-                )
-                
-                upload_results = self.bq_client.insert_records(
-                    dataset_id=self.config.bigquery.dataset_id,
-                    table_id=self.config.bigquery.meta_ads_table,
-                    records=insights_to_upload,
-                    batch_size=self.config.pipeline.batch_size
-                )
-                
+
+            if not dry_run:
                 results['steps']['upload'] = {
-                    'status': upload_results.get('status', 'success'),
-                    'processed': upload_results.get('processed', 0),
-                    'rows_affected': upload_results.get('rows_affected', 0)
+                    'status': upload_status,
+                    'processed': total_processed,
+                    'rows_affected': total_rows_affected,
+                    'methods': sorted(upload_methods)
                 }
             else:
                 logger.info("Step 4: Skipping BigQuery upload (dry run)")
                 results['steps']['upload'] = {'status': 'skipped'}
-            
+
 
             
             # Complete
-            end_time = datetime.now()
-            results['end_time'] = end_time.isoformat()
-            results['duration_seconds'] = (end_time - start_time).total_seconds()
+            results['end_time'] = datetime.now().isoformat()
+            results['duration_seconds'] = (time.monotonic_ns() - start_ns) / 1e9
             results['status'] = 'completed'
             
-            logger.info(f"Pipeline completed successfully in {results['duration_seconds']:.2f} seconds")
+            logger.info("Pipeline completed successfully in %.2f seconds", results['duration_seconds'])
             
         except Exception as e:
-            logger.error(f"Pipeline failed with error: {str(e)}")
+            logger.error("Pipeline failed with error: %s", e)
             results['status'] = 'failed'
             results['error'] = str(e)
             raise
@@ -187,7 +262,7 @@ class FacebookToBigQueryPipeline:
             'until': end_date.strftime('%Y-%m-%d')
         }
         
-        logger.info(f"Running incremental sync for {days_back} days: {time_range}")
+        logger.info("Running incremental sync for %s days: %s", days_back, time_range)
         return self.run_full_sync(time_range=time_range)
     
     def run_date_range_sync(self, 
@@ -207,7 +282,7 @@ class FacebookToBigQueryPipeline:
             'until': end_date
         }
         
-        logger.info(f"Running date range sync: {time_range}")
+        logger.info("Running date range sync: %s", time_range)
         return self.run_full_sync(time_range=time_range)
     
     def validate_only(self, 
@@ -224,14 +299,20 @@ class FacebookToBigQueryPipeline:
         return self.run_full_sync(time_range=time_range, dry_run=True)
     
     def _save_invalid_records(self, invalid_records: List[Dict]):
-        """Save invalid records to a file for debugging"""
+        """Save invalid records as gzipped NDJSON for debugging
+
+        NDJSON can be loaded straight back into BigQuery for recovery and
+        compresses far better than an indented JSON array.
+        """
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"invalid_records_{timestamp}.json"
-        
-        with open(filename, 'w') as f:
-            json.dump(invalid_records, f, indent=2)
-        
-        logger.warning(f"Saved {len(invalid_records)} invalid records to {filename}")
+        filename = f"invalid_records_{timestamp}.ndjson.gz"
+
+        with gzip.open(filename, 'wb', compresslevel=1) as f:
+            for record in invalid_records:
+                f.write(orjson.dumps(record, option=orjson.OPT_NON_STR_KEYS))
+                f.write(b"\n")
+
+        logger.warning("Saved %s invalid records to %s", len(invalid_records), filename)
     
     def get_pipeline_status(self) -> Dict[str, Any]:
         """Get current pipeline configuration and status"""
@@ -249,19 +330,19 @@ class FacebookToBigQueryPipeline:
 # Convenience functions for direct execution
 def run_full_sync(config: Config = None, **kwargs) -> Dict[str, Any]:
     """Convenience function to run full sync"""
-    pipeline = FacebookToBigQueryPipeline(config)
+    pipeline = FacebookToBigQueryPipeline.for_config(config)
     return pipeline.run_full_sync(**kwargs)
 
 
 def run_incremental_sync(days_back: int = 7, config: Config = None) -> Dict[str, Any]:
     """Convenience function to run incremental sync"""
-    pipeline = FacebookToBigQueryPipeline(config)
+    pipeline = FacebookToBigQueryPipeline.for_config(config)
     return pipeline.run_incremental_sync(days_back)
 
 
 def run_date_range_sync(start_date: str, end_date: str, config: Config = None) -> Dict[str, Any]:
     """Convenience function to run date range sync"""
-    pipeline = FacebookToBigQueryPipeline(config)
+    pipeline = FacebookToBigQueryPipeline.for_config(config)
     return pipeline.run_date_range_sync(start_date, end_date)
 
 
@@ -301,8 +382,8 @@ if __name__ == "__main__":
         elif args.mode == 'validate':
             results = pipeline.validate_only()
         
-        print(json.dumps(results, indent=2))
+        print(orjson.dumps(results, option=orjson.OPT_INDENT_2, default=str).decode())
         
     except Exception as e:
-        logger.error(f"Pipeline execution failed: {str(e)}")
+        logger.error("Pipeline execution failed: %s", e)
         exit(1) 
\ No newline at end of file
@@ -1,15 +1,73 @@
 import logging
+import os
+import time
 import pandas as pd
-import pandas_gbq
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict, Optional
-from datetime import datetime
+from datetime import datetime, timezone
+from google.cloud import bigquery
+from SchemaRegistry import SchemaRegistry
 
 logger = logging.getLogger(__name__)
 
+# BigQuery types for the KPI mapping table, keyed by FieldSchema.type.
+# last_updated is stamped as an ISO timestamp string, hence TIMESTAMP.
+_KPI_BQ_TYPES = {str: 'STRING', 'date': 'TIMESTAMP'}
+
+
+def _kpi_mapping_bq_schema() -> List[bigquery.SchemaField]:
+    """Build the BigQuery schema for the KPI mapping table from the registry"""
+    return [
+        bigquery.SchemaField(field, _KPI_BQ_TYPES.get(info.type, 'STRING'))
+        for field, info in SchemaRegistry.get_schema('kpi_mapping').items()
+    ]
+
+
+# Standard mappings are static configuration, so they are built once at
+# import as a frozen tuple instead of a fresh list on every call
+_STANDARD_MAPPINGS = (
+    # Standard event mappings
+    # {'user_friendly_name': 'Lead', 'meta_action_type': 'lead', 'mapping_type': 'standard', 'ad_account_id': 'all'},
+    # {'user_friendly_name': 'Video View', 'meta_action_type': 'video_view', 'mapping_type': 'standard', 'ad_account_id': 'all'},
+    # {'user_friendly_name': 'Purchase', 'meta_action_type': 'purchase', 'mapping_type': 'standard', 'ad_account_id': 'all'},
+    # {'user_friendly_name': 'Page View', 'meta_action_type': 'page_view', 'mapping_type': 'standard', 'ad_account_id': 'all'},
+    # {'user_friendly_name': 'Link Click', 'meta_action_type': 'link_click', 'mapping_type': 'standard', 'ad_account_id': 'all'},
+    # {'user_friendly_name': 'Page Engagement', 'meta_action_type': 'page_engagement', 'mapping_type': 'standard', 'ad_account_id': 'all'},
+    # {'user_friendly_name': 'Post Engagement', 'meta_action_type': 'post_engagement', 'mapping_type': 'standard', 'ad_account_id': 'all'},
+    # {'user_friendly_name': 'Landing Page View', 'meta_action_type': 'landing_page_view', 'mapping_type': 'standard', 'ad_account_id': 'all'},
+    # {'user_friendly_name': 'Post Reaction', 'meta_action_type': 'post_reaction', 'mapping_type': 'standard', 'ad_account_id': 'all'},
+    # {'user_friendly_name': 'Post Save', 'meta_action_type': 'post_save', 'mapping_type': 'standard', 'ad_account_id': 'all'},
+    # {'user_friendly_name': 'Web Lead', 'meta_action_type': 'web_lead', 'mapping_type': 'standard', 'ad_account_id': 'all'},
+    # {'user_friendly_name': 'Click On Platform', 'meta_action_type': 'click', 'mapping_type': 'standard', 'ad_account_id': 'all'},
+    # {'user_friendly_name': 'Click To Website', 'meta_action_type': 'link_click', 'mapping_type': 'standard', 'ad_account_id': 'all'},
+    # {'user_friendly_name': 'Lead Website', 'meta_action_type': 'onsite_web_lead', 'mapping_type': 'standard', 'ad_account_id': 'all'},
+    # {'user_friendly_name': 'Video View 3sec', 'meta_action_type': 'video_view', 'mapping_type': 'standard', 'ad_account_id': 'all'},
+    # {'user_friendly_name': 'View Content', 'meta_action_type': 'view_content', 'mapping_type': 'standard', 'ad_account_id': 'all'},
+    # {'user_friendly_name': 'Add To Cart', 'meta_action_type': 'add_to_cart', 'mapping_type': 'standard', 'ad_account_id': 'all'},
+    # {'user_friendly_name': 'Initiate Checkout', 'meta_action_type': 'initiate_checkout', 'mapping_type': 'standard', 'ad_account_id': 'all'},
+    # {'user_friendly_name': 'Complete Registration', 'meta_action_type': 'complete_registration', 'mapping_type': 'standard', 'ad_account_id': 'all'},
+    # {'user_friendly_name': 'Omni Landing Page View', 'meta_action_type': 'omni_landing_page_view', 'mapping_type': 'standard', 'ad_account_id': 'all'},
+    # Pixel event mappings
+    # {'user_friendly_name': 'Lead', 'meta_action_type': 'offsite_conversion.fb_pixel_lead', 'mapping_type': 'pixel', 'ad_account_id': 'all'},
+    # {'user_friendly_name': 'Purchase', 'meta_action_type': 'offsite_conversion.fb_pixel_purchase', 'mapping_type': 'pixel', 'ad_account_id': 'all'},
+    {'user_friendly_name': 'offsite_conversion.fb_pixel_custom', 'meta_action_type': 'offsite_conversion.fb_pixel_custom', 'mapping_type': 'pixel', 'ad_account_id': '1052847603363129'},
+)
+
 
 class KPIMappingManager:
     """Manages KPI event mappings between user-friendly names and Facebook action types"""
-    
+
+    # How long get_all_mappings may serve from the in-memory cache
+    MAPPINGS_CACHE_TTL = 300.0
+
+    # A mapping table younger than this skips the Graph API refresh
+    KPI_REFRESH_SECONDS = float(os.getenv('PIPELINE_KPI_REFRESH_SECONDS', '21600'))
+
+    # Custom conversions rarely change; per-account results younger than
+    # this skip the Graph API round-trip entirely
+    CUSTOM_CONVERSIONS_TTL = 3600.0
+
     def __init__(self, facebook_client, bigquery_client):
         """Initialize KPI mapping manager
         
@@ -20,81 +78,118 @@ class KPIMappingManager:
         self.fb_client = facebook_client
         self.bq_client = bigquery_client
         self.mapping_table = "rollup_reference.kpi_event_mapping"
+        self.staging_table = f"{self.mapping_table}__stage"
         self._mappings_cache = None
-    
+        self._cache_loaded_at = None
+        # Full-row DataFrame for get_all_mappings; kept separate from the
+        # lookup cache, which only holds the three lookup columns
+        self._all_mappings_df = None
+        self._all_mappings_loaded_at = None
+        # Per-account custom conversions with their fetch time, so repeat
+        # syncs within the TTL skip the Graph API entirely
+        self._custom_conversions_cache: Dict[str, tuple] = {}
+
     def get_standard_mappings(self) -> List[Dict]:
         """Get standard event mappings that apply to all accounts
-        
+
         Returns:
             List of standard mapping dictionaries
         """
-        return [
-            # Standard event mappings
-            # {'user_friendly_name': 'Lead', 'meta_action_type': 'lead', 'mapping_type': 'standard', 'ad_account_id': 'all'},
-            # {'user_friendly_name': 'Video View', 'meta_action_type': 'video_view', 'mapping_type': 'standard', 'ad_account_id': 'all'},
-            # {'user_friendly_name': 'Purchase', 'meta_action_type': 'purchase', 'mapping_type': 'standard', 'ad_account_id': 'all'},
-            # {'user_friendly_name': 'Page View', 'meta_action_type': 'page_view', 'mapping_type': 'standard', 'ad_account_id': 'all'},
-            # {'user_friendly_name': 'Link Click', 'meta_action_type': 'link_click', 'mapping_type': 'standard', 'ad_account_id': 'all'},
-            # {'user_friendly_name': 'Page Engagement', 'meta_action_type': 'page_engagement', 'mapping_type': 'standard', 'ad_account_id': 'all'},
-            # {'user_friendly_name': 'Post Engagement', 'meta_action_type': 'post_engagement', 'mapping_type': 'standard', 'ad_account_id': 'all'},
-            # {'user_friendly_name': 'Landing Page View', 'meta_action_type': 'landing_page_view', 'mapping_type': 'standard', 'ad_account_id': 'all'},
-            # {'user_friendly_name': 'Post Reaction', 'meta_action_type': 'post_reaction', 'mapping_type': 'standard', 'ad_account_id': 'all'},
-            # {'user_friendly_name': 'Post Save', 'meta_action_type': 'post_save', 'mapping_type': 'standard', 'ad_account_id': 'all'},
-            # {'user_friendly_name': 'Web Lead', 'meta_action_type': 'web_lead', 'mapping_type': 'standard', 'ad_account_id': 'all'},
-            # {'user_friendly_name': 'Click On Platform', 'meta_action_type': 'click', 'mapping_type': 'standard', 'ad_account_id': 'all'},
-            # {'user_friendly_name': 'Click To Website', 'meta_action_type': 'link_click', 'mapping_type': 'standard', 'ad_account_id': 'all'},
-            # {'user_friendly_name': 'Lead Website', 'meta_action_type': 'onsite_web_lead', 'mapping_type': 'standard', 'ad_account_id': 'all'},
-            # {'user_friendly_name': 'Video View 3sec', 'meta_action_type': 'video_view', 'mapping_type': 'standard', 'ad_account_id': 'all'},
-            # {'user_friendly_name': 'View Content', 'meta_action_type': 'view_content', 'mapping_type': 'standard', 'ad_account_id': 'all'},
-            # {'user_friendly_name': 'Add To Cart', 'meta_action_type': 'add_to_cart', 'mapping_type': 'standard', 'ad_account_id': 'all'},
-            # {'user_friendly_name': 'Initiate Checkout', 'meta_action_type': 'initiate_checkout', 'mapping_type': 'standard', 'ad_account_id': 'all'},
-            # {'user_friendly_name': 'Complete Registration', 'meta_action_type': 'complete_registration', 'mapping_type': 'standard', 'ad_account_id': 'all'},
-            # {'user_friendly_name': 'Omni Landing Page View', 'meta_action_type': 'omni_landing_page_view', 'mapping_type': 'standard', 'ad_account_id': 'all'},
-            # Pixel event mappings  
-            # {'user_friendly_name': 'Lead', 'meta_action_type': 'offsite_conversion.fb_pixel_lead', 'mapping_type': 'pixel', 'ad_account_id': 'all'},
-            # {'user_friendly_name': 'Purchase', 'meta_action_type': 'offsite_conversion.fb_pixel_purchase', 'mapping_type': 'pixel', 'ad_account_id': 'all'},
-            {'user_friendly_name': 'offsite_conversion.fb_pixel_custom', 'meta_action_type': 'offsite_conversion.fb_pixel_custom', 'mapping_type': 'pixel', 'ad_account_id': '1052847603363129'},
-        ]
-    
+        return list(_STANDARD_MAPPINGS)
+
     def fetch_custom_mappings(self, ad_account_ids: List[str] = None) -> List[Dict]:
         """Fetch custom conversions from Facebook for specified ad accounts
-        
+
+        Results are memoized per account for CUSTOM_CONVERSIONS_TTL, so
+        only accounts with stale (or no) cached results cost a Graph API
+        round-trip; failed fetches are not cached.
+
         Args:
             ad_account_ids: List of ad account IDs (defaults to env var)
-            
+
         Returns:
             List of custom conversion mappings
         """
         if ad_account_ids is None:
             ad_account_ids = self.fb_client.get_ad_account_ids()
-        
+
         all_custom_mappings = []
-        
+
+        if not ad_account_ids:
+            return all_custom_mappings
+
+        now = time.monotonic()
+        stale_ids = []
         for account_id in ad_account_ids:
-            logger.info(f"Fetching custom conversions for account: {account_id}")
-            
-            try:
-                custom_mappings = self.fb_client.get_custom_conversions(account_id)
-                all_custom_mappings.extend(custom_mappings)
-                logger.info(f"Found {len(custom_mappings)} custom conversions for account {account_id}")
-            except Exception as e:
-                logger.error(f"Error fetching custom conversions for account {account_id}: {e}")
-                continue
-        
-        logger.info(f"Total custom conversions found: {len(all_custom_mappings)}")
+            cached = self._custom_conversions_cache.get(account_id)
+            if cached is not None and now - cached[0] < self.CUSTOM_CONVERSIONS_TTL:
+                all_custom_mappings.extend(cached[1])
+            else:
+                stale_ids.append(account_id)
+
+        if not stale_ids:
+            logger.info("All %s accounts served from custom conversions cache", len(ad_account_ids))
+            return all_custom_mappings
+
+        # Each fetch is an independent Graph API round-trip, so fan them out
+        with ThreadPoolExecutor(max_workers=min(8, len(stale_ids))) as executor:
+            futures = {
+                executor.submit(self.fb_client.get_custom_conversions, account_id): account_id
+                for account_id in stale_ids
+            }
+
+            for future in as_completed(futures):
+                account_id = futures[future]
+                try:
+                    custom_mappings = future.result()
+                    self._custom_conversions_cache[account_id] = (now, custom_mappings)
+                    all_custom_mappings.extend(custom_mappings)
+                    logger.info("Found %s custom conversions for account %s", len(custom_mappings), account_id)
+                except Exception as e:
+                    logger.error("Error fetching custom conversions for account %s: %s", account_id, e)
+                    continue
+
+        logger.info("Total custom conversions found: %s", len(all_custom_mappings))
         return all_custom_mappings
     
-    def update_mapping_table(self, include_custom: bool = True) -> Dict[str, int]:
+    def _mapping_table_is_fresh(self) -> bool:
+        """Check whether the mapping table was refreshed recently
+
+        Runs a cheap MAX(last_updated) probe; any failure (missing table,
+        empty table) reports stale so the refresh proceeds.
+        """
+        try:
+            query = f"SELECT MAX(last_updated) AS last_updated FROM `{self.mapping_table}`"
+            row = next(iter(self.bq_client.client.query(query).result()), None)
+            if row is None or row.last_updated is None:
+                return False
+
+            last_updated = row.last_updated
+            if last_updated.tzinfo is None:
+                last_updated = last_updated.replace(tzinfo=timezone.utc)
+
+            age = (datetime.now(timezone.utc) - last_updated).total_seconds()
+            return age < self.KPI_REFRESH_SECONDS
+        except Exception as e:
+            logger.warning("Could not check mapping table freshness: %s", e)
+            return False
+
+    def update_mapping_table(self, include_custom: bool = True, force: bool = False) -> Dict[str, int]:
         """Update the BigQuery mapping table with fresh data
-        
+
         Args:
             include_custom: Whether to fetch and include custom conversions
-            
+            force: Refresh even if the table is younger than KPI_REFRESH_SECONDS
+
         Returns:
             Dictionary with counts of mappings by type
         """
+        if not force and self._mapping_table_is_fresh():
+            logger.info("KPI mapping table is fresh, skipping refresh")
+            return {'standard': 0, 'custom': 0, 'total': 0, 'skipped': True}
+
         logger.info("Updating KPI event mapping table...")
-        
+
         # Start with standard mappings
         all_mappings = self.get_standard_mappings()
         standard_count = len(all_mappings)
@@ -112,29 +207,50 @@ class KPIMappingManager:
         
         # Update BigQuery table
         try:
-            df = pd.DataFrame(all_mappings)
-            
-            # Add timestamp for tracking
-            df['last_updated'] = pd.Timestamp.now()
-            
-            # Use pandas_gbq to update the table
-            pandas_gbq.to_gbq(
-                df,
-                destination_table=self.mapping_table,
-                project_id='ivc-media-ads-warehouse',
-                if_exists='replace',
-                credentials=self.bq_client.client._credentials
+            # Stamp the whole batch once so every row shares the same
+            # timestamp; dedupe on the merge key so MERGE cannot hit
+            # multiple source rows for one target row
+            last_updated = datetime.utcnow().isoformat()
+            deduped = {
+                (mapping['ad_account_id'], mapping['user_friendly_name'],
+                 mapping['meta_action_type']): mapping
+                for mapping in all_mappings
+            }
+            rows = [{**mapping, 'last_updated': last_updated} for mapping in deduped.values()]
+
+            # Stage the snapshot, then MERGE: unchanged rows cost no
+            # rewrite slot-time the way WRITE_TRUNCATE on the live table
+            # did, and readers never see a half-replaced table
+            job_config = bigquery.LoadJobConfig(
+                write_disposition="WRITE_TRUNCATE",
+                schema=_kpi_mapping_bq_schema()
             )
-            
-            logger.info(f"Successfully updated mapping table with {len(all_mappings)} total mappings")
-            
+            self.bq_client.client.load_table_from_json(
+                rows,
+                self.staging_table,
+                job_config=job_config
+            ).result()
+
+            self._ensure_mapping_table_exists()
+            self.bq_client.client.query(self._build_merge_query()).result()
+
+            logger.info("Successfully updated mapping table with %s total mappings", len(all_mappings))
+
             # Print summary
-            summary = df.groupby(['ad_account_id', 'mapping_type']).size().reset_index(name='count')
-            logger.info("\nMapping summary:")
-            logger.info(summary.to_string(index=False))
+            summary = Counter(
+                (mapping.get('ad_account_id'), mapping.get('mapping_type'))
+                for mapping in all_mappings
+            )
+            logger.info("\nMapping summary:\n%s", "\n".join(
+                f"  {account_id} {mapping_type}: {count}"
+                for (account_id, mapping_type), count in sorted(summary.items())
+            ))
             
-            # Clear cache after update
+            # Clear caches after update
             self._mappings_cache = None
+            self._cache_loaded_at = None
+            self._all_mappings_df = None
+            self._all_mappings_loaded_at = None
             
             return {
                 'standard': standard_count,
@@ -143,9 +259,61 @@ class KPIMappingManager:
             }
             
         except Exception as e:
-            logger.error(f"Error updating BigQuery table: {e}")
+            logger.error("Error updating BigQuery table: %s", e)
             raise
     
+    def _ensure_mapping_table_exists(self):
+        """Create the live mapping table if it does not exist yet
+
+        The old pandas_gbq path (if_exists='replace') auto-created the
+        table; the load job only auto-creates the staging table, so on a
+        fresh project the MERGE target has to be created explicitly or the
+        MERGE raises NotFound.
+        """
+        columns = ",\n            ".join(
+            f"{field.name} {field.field_type}"
+            for field in _kpi_mapping_bq_schema()
+        )
+        self.bq_client.client.query(f"""
+        CREATE TABLE IF NOT EXISTS `{self.mapping_table}` (
+            {columns}
+        )
+        """).result()
+
+    def _build_merge_query(self) -> str:
+        """Render the staging-to-live MERGE for the mapping table
+
+        Keyed on (ad_account_id, user_friendly_name, meta_action_type) --
+        two friendly names may legitimately map to the same action type
+        (e.g. 'Link Click' and 'Click To Website' both to link_click), so
+        the name has to be part of the key. Rows absent from the staged
+        snapshot are deleted so the result matches the old WRITE_TRUNCATE
+        replace semantics.
+        """
+        fields = list(SchemaRegistry.get_schema('kpi_mapping'))
+        update_fields = [f for f in fields
+                         if f not in ('ad_account_id', 'user_friendly_name',
+                                      'meta_action_type')]
+        update_clause = ",\n                ".join(f"{f} = S.{f}" for f in update_fields)
+        insert_columns = ", ".join(fields)
+        insert_values = ", ".join(f"S.{f}" for f in fields)
+
+        return f"""
+        MERGE `{self.mapping_table}` T
+        USING `{self.staging_table}` S
+        ON T.ad_account_id = S.ad_account_id
+        AND T.user_friendly_name = S.user_friendly_name
+        AND T.meta_action_type = S.meta_action_type
+        WHEN MATCHED THEN
+            UPDATE SET
+                {update_clause}
+        WHEN NOT MATCHED THEN
+            INSERT ({insert_columns})
+            VALUES ({insert_values})
+        WHEN NOT MATCHED BY SOURCE THEN
+            DELETE
+        """
+
     def get_mapping_for_account(self, ad_account_id: str, kpi_name: str) -> Optional[str]:
         """Get the Facebook action type for a given KPI name and account
         
@@ -158,15 +326,16 @@ class KPIMappingManager:
         """
         if self._mappings_cache is None:
             self._load_mappings()
-        
+
         # First check for account-specific mapping
-        account_key = f"{ad_account_id}:{kpi_name}"
-        if account_key in self._mappings_cache:
-            return self._mappings_cache[account_key]
-        
+        account_mappings = self._mappings_cache.get(ad_account_id)
+        if account_mappings is not None:
+            action_type = account_mappings.get(kpi_name)
+            if action_type is not None:
+                return action_type
+
         # Fall back to 'all' account mapping
-        all_key = f"all:{kpi_name}"
-        return self._mappings_cache.get(all_key)
+        return self._mappings_cache.get('all', {}).get(kpi_name)
     
     def _load_mappings(self):
         """Load mappings from BigQuery into cache"""
@@ -175,29 +344,52 @@ class KPIMappingManager:
             SELECT ad_account_id, user_friendly_name, meta_action_type
             FROM `{self.mapping_table}`
             """
-            
+
             result = self.bq_client.client.query(query).result()
-            
-            self._mappings_cache = {}
-            for row in result:
-                key = f"{row.ad_account_id}:{row.user_friendly_name}"
-                self._mappings_cache[key] = row.meta_action_type
-            
-            logger.info(f"Loaded {len(self._mappings_cache)} mappings into cache")
-            
+
+            # Two-level dict keyed by ad_account_id then kpi_name, so
+            # lookups are plain dict gets with no key string construction
+            cache = defaultdict(dict)
+            try:
+                # Columnar fetch over the Storage Read API: three pylist()
+                # extractions instead of per-row Row object access
+                table = result.to_arrow(create_bqstorage_client=True)
+                for account, name, action_type in zip(
+                    table.column('ad_account_id').to_pylist(),
+                    table.column('user_friendly_name').to_pylist(),
+                    table.column('meta_action_type').to_pylist()
+                ):
+                    cache[account][name] = action_type
+            except Exception:
+                for row in result:
+                    cache[row.ad_account_id][row.user_friendly_name] = row.meta_action_type
+
+            self._mappings_cache = dict(cache)
+            self._cache_loaded_at = time.monotonic()
+            logger.info("Loaded %s mappings into cache", sum(map(len, cache.values())))
+
         except Exception as e:
-            logger.error(f"Error loading mappings from BigQuery: {e}")
+            logger.error("Error loading mappings from BigQuery: %s", e)
             self._mappings_cache = {}
     
     def get_all_mappings(self) -> pd.DataFrame:
         """Get all mappings as a DataFrame
-        
+
         Returns:
-            DataFrame with all KPI mappings
+            DataFrame with the full mapping table schema (ad_account_id,
+            user_friendly_name, meta_action_type, mapping_type,
+            facebook_conversion_id, last_updated)
         """
+        # The lookup cache only carries three columns, so this method keeps
+        # its own full-row cache: callers always get the complete table
+        # schema, and repeat calls within the TTL skip the query
+        if (self._all_mappings_df is not None
+                and self._all_mappings_loaded_at is not None
+                and time.monotonic() - self._all_mappings_loaded_at < self.MAPPINGS_CACHE_TTL):
+            return self._all_mappings_df.copy()
+
         query = f"SELECT * FROM `{self.mapping_table}`"
-        return pd.read_gbq(
-            query,
-            project_id=self.bq_client.project_id,
-            credentials=self.bq_client.client._credentials
-        ) 
\ No newline at end of file
+        df = self.bq_client.client.query(query).to_dataframe(create_bqstorage_client=True)
+        self._all_mappings_df = df
+        self._all_mappings_loaded_at = time.monotonic()
+        return df.copy()
\ No newline at end of file
@@ -1,11 +1,17 @@
+from functools import lru_cache
 from typing import Dict, Any, Type, Optional, List
 from google.cloud import bigquery
 
 
 class FieldSchema:
     """Enhanced field schema with validation and metadata"""
-    
-    def __init__(self, 
+
+    # 'validate' is a slot because each instance binds its own compiled
+    # validator closure
+    __slots__ = ('type', 'nullable', 'nested', 'description',
+                 'default_value', 'validate')
+
+    def __init__(self,
                  field_type: Type,
                  nullable: bool = True,
                  nested: bool = False,
@@ -25,21 +31,28 @@ class FieldSchema:
         self.nested = nested
         self.description = description
         self.default_value = default_value
-    
-    def validate(self, value: Any) -> bool:
-        """Validate a value against this field schema"""
-        if value is None:
-            return self.nullable
-        
-        if self.type == 'date':
-            # Date validation is handled separately
-            return isinstance(value, str)
-        elif self.nested:
+        # Schemas are static, so specialize validate at construction time
+        # instead of re-branching on type/nested/nullable per call
+        self.validate = self._compile_validator()
+
+    def _compile_validator(self):
+        """Build a per-field validate(value) -> bool closure
+
+        Exact type checks (`type(v) is X`) are used instead of isinstance
+        since subclasses never appear in API payloads.
+        """
+        if self.nested:
             # Nested fields should be lists
-            return isinstance(value, list)
+            expected = list
+        elif self.type == 'date':
+            # Date validation is handled separately
+            expected = str
         else:
-            # For regular types, check instance
-            return isinstance(value, self.type)
+            expected = self.type
+
+        if self.nullable:
+            return lambda value: value is None or type(value) is expected
+        return lambda value: type(value) is expected
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary format for compatibility"""
@@ -52,6 +65,25 @@ class FieldSchema:
         }
 
 
+def _categorize(schema: Dict[str, FieldSchema]) -> Dict[str, tuple]:
+    """Bucket a schema's fields by kind, freezing each bucket as a tuple"""
+    buckets = {
+        'float_fields': [],
+        'int_fields': [],
+        'date_fields': [],
+        'string_fields': [],
+        'nested_fields': []
+    }
+    type_buckets = {float: 'float_fields', int: 'int_fields',
+                    'date': 'date_fields', str: 'string_fields'}
+    for field, info in schema.items():
+        if info.nested:
+            buckets['nested_fields'].append(field)
+        elif info.type in type_buckets:
+            buckets[type_buckets[info.type]].append(field)
+    return {name: tuple(fields) for name, fields in buckets.items()}
+
+
 class SchemaRegistry:
     """Central registry for all data schemas"""
     
@@ -110,6 +142,14 @@ class SchemaRegistry:
         'video_thruplay_watched_actions': FieldSchema(int, nested=True, description="Video thruplay views"),
     }
     
+    # Flat (type, nullable, nested) tuples per field, computed once at
+    # import time so hot validation loops do one dict lookup per field
+    # instead of walking FieldSchema attributes
+    INSIGHTS_TYPES = {
+        field: (info.type, info.nullable, info.nested)
+        for field, info in INSIGHTS_SCHEMA.items()
+    }
+
     # KPI Event Mapping Schema
     KPI_MAPPING_SCHEMA = {
         'user_friendly_name': FieldSchema(str, nullable=False, description="Human-readable KPI name"),
@@ -119,8 +159,15 @@ class SchemaRegistry:
         'facebook_conversion_id': FieldSchema(str, description="Facebook conversion ID"),
         'last_updated': FieldSchema('date', description="Last update timestamp")
     }
-    
+
+    # Categorized field tuples, frozen once at class-body evaluation so
+    # get_field_lists is a dict lookup at runtime
+    INSIGHTS_FIELDS = _categorize(INSIGHTS_SCHEMA)
+    KPI_MAPPING_FIELDS = _categorize(KPI_MAPPING_SCHEMA)
+
+
     @classmethod
+    @lru_cache(maxsize=None)
     def get_schema(cls, schema_name: str) -> Dict[str, FieldSchema]:
         """Get a specific schema by name"""
         schemas = {
@@ -134,38 +181,36 @@ class SchemaRegistry:
         return schemas[schema_name]
     
     @classmethod
+    @lru_cache(maxsize=None)
+    def get_types(cls, schema_name: str) -> Dict[str, tuple]:
+        """Get a flat {field: (type, nullable, nested)} map for a schema"""
+        if schema_name == 'insights':
+            return cls.INSIGHTS_TYPES
+        schema = cls.get_schema(schema_name)
+        return {
+            field: (info.type, info.nullable, info.nested)
+            for field, info in schema.items()
+        }
+
+    @classmethod
+    @lru_cache(maxsize=None)
     def get_schema_dict(cls, schema_name: str) -> Dict[str, Dict[str, Any]]:
         """Get schema in dictionary format for backward compatibility"""
         schema = cls.get_schema(schema_name)
         return {field: info.to_dict() for field, info in schema.items()}
-    
+
     @classmethod
-    def get_field_lists(cls, schema_name: str) -> Dict[str, list]:
-        """Get categorized field lists for a schema"""
-        schema = cls.get_schema(schema_name)
-        
-        return {
-            'float_fields': [
-                field for field, info in schema.items() 
-                if info.type == float and not info.nested
-            ],
-            'int_fields': [
-                field for field, info in schema.items() 
-                if info.type == int and not info.nested
-            ],
-            'date_fields': [
-                field for field, info in schema.items() 
-                if info.type == 'date' and not info.nested
-            ],
-            'string_fields': [
-                field for field, info in schema.items() 
-                if info.type == str and not info.nested
-            ],
-            'nested_fields': [
-                field for field, info in schema.items() 
-                if info.nested
-            ]
-        } 
+    def get_field_lists(cls, schema_name: str) -> Dict[str, tuple]:
+        """Get categorized field tuples for a schema"""
+        field_lists = {
+            'insights': cls.INSIGHTS_FIELDS,
+            'kpi_mapping': cls.KPI_MAPPING_FIELDS
+        }
+
+        if schema_name not in field_lists:
+            raise ValueError(f"Unknown schema: {schema_name}")
+
+        return field_lists[schema_name]
     
     @classmethod
     def to_bigquery_schema(cls, schema_name: str = 'insights') -> List[bigquery.SchemaField]:
@@ -0,0 +1,100 @@
+"""Optional Numba-accelerated validation kernels
+
+DataValidator imports this module behind a try/except: when numba is not
+installed the import fails and the validator stays on its pandas path, so
+numba remains an optional dependency.
+
+The kernel is a hand-written ASCII float parser because Numba cannot
+compile float(str); it iterates rows with prange since each row is
+independent, and keeps a single exit per row so parallelization stays
+active.
+"""
+import numpy as np
+import pandas as pd
+from numba import njit, prange
+
+
+@njit(cache=True)
+def _parse_float(s):
+    """Parse one decimal string; returns (value, ok)"""
+    n = len(s)
+    if n == 0:
+        return 0.0, False
+
+    i = 0
+    sign = 1.0
+    if s[0] == '-':
+        sign = -1.0
+        i = 1
+    elif s[0] == '+':
+        i = 1
+
+    mantissa = 0.0
+    digits = 0
+    while i < n and '0' <= s[i] <= '9':
+        mantissa = mantissa * 10.0 + (ord(s[i]) - 48)
+        digits += 1
+        i += 1
+
+    frac_scale = 1.0
+    if i < n and s[i] == '.':
+        i += 1
+        while i < n and '0' <= s[i] <= '9':
+            mantissa = mantissa * 10.0 + (ord(s[i]) - 48)
+            frac_scale *= 10.0
+            digits += 1
+            i += 1
+
+    if digits == 0:
+        return 0.0, False
+
+    exponent = 0
+    if i < n and (s[i] == 'e' or s[i] == 'E'):
+        i += 1
+        exp_sign = 1
+        if i < n and (s[i] == '-' or s[i] == '+'):
+            if s[i] == '-':
+                exp_sign = -1
+            i += 1
+        exp_digits = 0
+        while i < n and '0' <= s[i] <= '9':
+            exponent = exponent * 10 + (ord(s[i]) - 48)
+            exp_digits += 1
+            i += 1
+        if exp_digits == 0:
+            return 0.0, False
+        exponent *= exp_sign
+
+    if i != n:
+        return 0.0, False
+
+    return sign * mantissa / frac_scale * 10.0 ** exponent, True
+
+
+@njit(cache=True, parallel=True)
+def _parse_float_array(arr, out_vals, out_ok):
+    for i in prange(arr.shape[0]):
+        value, ok = _parse_float(arr[i])
+        out_vals[i] = value
+        out_ok[i] = ok
+
+
+def coerce_float_column(column: pd.Series):
+    """Coerce an all-string column to floats with the JIT kernel
+
+    Returns a float Series with NaN where parsing failed, or None when the
+    column contains non-string values (nulls, pre-typed numbers) and the
+    caller should fall back to pd.to_numeric.
+    """
+    values = column.to_numpy()
+    if values.dtype != object:
+        return None
+    for value in values:
+        if type(value) is not str:
+            return None
+
+    arr = np.asarray(values, dtype=np.str_)
+    out_vals = np.empty(arr.shape[0], dtype=np.float64)
+    out_ok = np.empty(arr.shape[0], dtype=np.bool_)
+    _parse_float_array(arr, out_vals, out_ok)
+    return pd.Series(np.where(out_ok, out_vals, np.nan), index=column.index)
@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, HTTPException
 from dotenv import load_dotenv
 import os
@@ -5,7 +7,7 @@ from typing import List, Dict, Any, Optional
 import asyncio
 import logging
 import sys
-import json
+import orjson
 
 # Import the new pipeline class
 from FacebookToBigQueryPipeline import FacebookToBigQueryPipeline
@@ -19,11 +21,32 @@ logging.basicConfig(
 )
 
 logger = logging.getLogger(__name__)
-load_dotenv()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run env loading and client warm-up at startup instead of import
+
+    Import time stays cheap for worker forks; the default pipeline (and
+    with it the Facebook SDK session and pooled BigQuery client) is built
+    once per instance before the first request hits. Warm-up failure is
+    logged but not fatal — a misconfigured instance can still serve
+    /health and report the error per request.
+    """
+    load_dotenv()
+    try:
+        app.state.pipeline = await asyncio.to_thread(FacebookToBigQueryPipeline.for_config)
+        logger.info("Pipeline warmed up at startup")
+    except Exception as e:
+        app.state.pipeline = None
+        logger.warning(f"Pipeline warm-up failed, will initialize per request: {e}")
+    yield
+
 
 app = FastAPI(
     title="Facebook Ads to BigQuery Sync",
-    description="API to sync Facebook Ads insights data to BigQuery"
+    description="API to sync Facebook Ads insights data to BigQuery",
+    lifespan=lifespan
 )
 @app.get("/health")
 async def health_check() -> Dict[str, str]:
@@ -146,15 +169,15 @@ async def test_sync_status() -> Dict[str, Any]:
     Useful for debugging and verifying configuration.
     """
     try:
-        # Create pipeline to check configuration
-        pipeline = FacebookToBigQueryPipeline()
+        # Prefer the pipeline warmed up at startup
+        pipeline = app.state.pipeline or FacebookToBigQueryPipeline()
         status = pipeline.get_pipeline_status()
         
         # Add environment info
         status['environment'] = {
             'dataset_id': os.getenv('DATASET_ID', 'Not set'),
             'table_id': os.getenv('TABLE_ID', 'Not set'),
-            'fb_account_count': len(json.loads(os.getenv('FB_AD_ACCOUNT_ID', '[]'))),
+            'fb_account_count': len(orjson.loads(os.getenv('FB_AD_ACCOUNT_ID', '[]'))),
             'pipeline_mode': 'class-based (new)'
         }
         